@@ -6,14 +6,33 @@ import atexit
 from config import Config
 
 
-def create_app():
-    """Create and configure the Flask application."""
+def create_app(test_config=None):
+    """
+    Create and configure the Flask application.
+    
+    Args:
+        test_config: Optional config overrides applied before extensions are
+            initialized (engine options are only read at init time)
+    """
     app = Flask(__name__)
     app.config.from_object(Config)
+    if test_config:
+        app.config.update(test_config)
+    
+    # Serialize JSON responses with orjson
+    from app.json_provider import ORJSONProvider
+    app.json = ORJSONProvider(app)
 
     # Initialize extensions
-    from app.extensions import db
+    from app.extensions import db, cache
     db.init_app(app)
+    cache.init_app(app)
+    
+    # Build Discogs API headers once instead of per release lookup
+    discogs_headers = {'User-Agent': app.config.get('DISCOGS_USER_AGENT', 'FreakinbeatsWebApp/1.0')}
+    if app.config.get('DISCOGS_TOKEN'):
+        discogs_headers['Authorization'] = f"Discogs token={app.config['DISCOGS_TOKEN']}"
+    app.extensions['discogs_headers'] = discogs_headers
     
     # Setup Flask-Assets
     assets = Environment(app)
@@ -35,10 +54,15 @@ def create_app():
     # Import models before creating tables
     from app.models import listing, access_log  # noqa: F401
     
-    # Create database tables
+    # Create database tables, then add columns and indexes models gained since a table was created
+    from app.models.schema import add_missing_columns, add_missing_indexes
     with app.app_context():
         db.create_all()
         app.logger.info("Database tables created")
+        for column in add_missing_columns(db.engine, db.metadata):
+            app.logger.info(f"Added missing column {column}")
+        for index in add_missing_indexes(db.engine, db.metadata):
+            app.logger.info(f"Created missing index {index}")
     
     # Initialize access logging middleware
     from app.middleware.access_logger import init_access_logging
@@ -72,12 +96,12 @@ def setup_scheduler(app):
         with app.app_context():
             try:
                 app.logger.info("Starting scheduled Discogs sync...")
-                sync_service = DiscogsSyncService(
+                with DiscogsSyncService(
                     token=app.config['DISCOGS_TOKEN'],
                     seller_username=app.config['DISCOGS_SELLER_USERNAME'],
                     user_agent=app.config['DISCOGS_USER_AGENT']
-                )
-                stats = sync_service.sync_all_listings()
+                ) as sync_service:
+                    stats = sync_service.sync_all_listings()
                 app.logger.info(f"Sync completed: {stats}")
             except Exception as e:
                 app.logger.error(f"Error during scheduled sync: {e}")
@@ -104,12 +128,12 @@ def setup_scheduler(app):
         with app.app_context():
             try:
                 app.logger.info("Running initial Discogs sync...")
-                sync_service = DiscogsSyncService(
+                with DiscogsSyncService(
                     token=app.config['DISCOGS_TOKEN'],
                     seller_username=app.config['DISCOGS_SELLER_USERNAME'],
                     user_agent=app.config['DISCOGS_USER_AGENT']
-                )
-                stats = sync_service.sync_all_listings()
+                ) as sync_service:
+                    stats = sync_service.sync_all_listings()
                 app.logger.info(f"Initial sync completed: {stats}")
             except Exception as e:
                 app.logger.error(f"Error during initial sync: {e}")
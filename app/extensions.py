@@ -1,6 +1,10 @@
 """Flask extensions initialization."""
+from flask_caching import Cache
 from flask_sqlalchemy import SQLAlchemy
 
 # Initialize SQLAlchemy
 db = SQLAlchemy()
 
+# Initialize Flask-Caching
+cache = Cache()
+
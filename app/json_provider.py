@@ -0,0 +1,45 @@
+"""
+orjson-backed JSON provider for Flask.
+
+Listing endpoints return thousands of rows, so responses are encoded with
+orjson instead of the standard library json module.
+"""
+
+import orjson
+from flask.json.provider import DefaultJSONProvider
+
+
+class ORJSONProvider(DefaultJSONProvider):
+    """JSON provider that serializes with orjson and falls back to Flask's defaults."""
+    
+    def dumps(self, obj, **kwargs) -> str:
+        """
+        Serialize data as JSON.
+        
+        Args:
+            obj: The data to serialize
+            **kwargs: Flask dump arguments; only ``indent`` is honoured
+            
+        Returns:
+            JSON string
+        """
+        option = orjson.OPT_NAIVE_UTC | orjson.OPT_NON_STR_KEYS
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if kwargs.get('indent'):
+            option |= orjson.OPT_INDENT_2
+        
+        return orjson.dumps(obj, default=self.default, option=option).decode()
+    
+    def loads(self, s, **kwargs):
+        """
+        Deserialize data as JSON.
+        
+        Args:
+            s: Text or UTF-8 bytes
+            **kwargs: Ignored
+            
+        Returns:
+            Deserialized data
+        """
+        return orjson.loads(s)
@@ -1,4 +1,4 @@
-from datetime import datetime
+from datetime import datetime, timezone
 from app.extensions import db
 
 
@@ -18,8 +18,8 @@ class LabelInfo(db.Model):
     
     # Metadata
     generated_by = db.Column(db.String(50), default='gemini-1.5-flash')  # LLM used to generate
-    generated_at = db.Column(db.DateTime, default=datetime.utcnow)
-    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    generated_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc))
+    updated_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc))
     
     # Cache control
     cache_valid = db.Column(db.Boolean, default=True)  # Invalidate to regenerate
@@ -6,6 +6,10 @@ class Listing(db.Model):
     """SQLAlchemy model for Discogs marketplace listings."""
     
     __tablename__ = 'listings'
+    __table_args__ = (
+        # Serves the COUNT/MAX(updated_at) aggregate in InventoryService.get_stats
+        db.Index('ix_listings_active_updated', 'is_active', 'updated_at'),
+    )
     
     # Primary key
     id = db.Column(db.Integer, primary_key=True)
@@ -87,6 +91,9 @@ class Listing(db.Model):
     # Flexible metadata storage for future extensions
     custom_metadata = db.Column(db.JSON, nullable=True)
     
+    # Digest of the sync-tracked fields as last written, so unchanged listings are skipped
+    content_hash = db.Column(db.String(16), nullable=True)
+    
     def to_dict(self):
         """Convert listing to dictionary for JSON serialization."""
         return {
@@ -137,6 +144,24 @@ class Listing(db.Model):
             'custom_metadata': self.custom_metadata
         }
     
+    def to_list_dict(self):
+        """Convert listing to the narrow dictionary used by list endpoints."""
+        return {
+            'id': self.id,
+            'listing_id': self.listing_id,
+            'condition': self.condition,
+            'sleeve_condition': self.sleeve_condition,
+            'posted': self.posted.isoformat() if self.posted else None,
+            'price_value': self.price_value,
+            'price_currency': self.price_currency,
+            'release_title': self.release_title,
+            'release_year': self.release_year,
+            'artist_names': self.artist_names,
+            'primary_artist': self.primary_artist,
+            'primary_label': self.primary_label,
+            'image_uri': self.image_uri
+        }
+    
     def __repr__(self):
         return f'<Listing {self.listing_id}: {self.release_title} by {self.primary_artist}>'
 
@@ -0,0 +1,83 @@
+"""
+In-place schema upgrades for existing databases.
+
+db.create_all() only creates missing tables, so columns and indexes added
+to a model after its table exists are never created. add_missing_columns and
+add_missing_indexes fill that gap without needing a migration framework.
+"""
+
+from typing import List
+from sqlalchemy import MetaData, inspect
+from sqlalchemy.engine import Engine
+
+
+def add_missing_columns(engine: Engine, metadata: MetaData) -> List[str]:
+    """
+    Add nullable model columns that are missing from existing tables.
+    
+    Safe to run on every start: columns that already exist are skipped.
+    NOT NULL columns are never added, since existing rows would have no value.
+    
+    Args:
+        engine: Engine for the database to upgrade
+        metadata: Metadata holding the model tables
+        
+    Returns:
+        Added columns as 'table.column' strings
+    """
+    inspector = inspect(engine)
+    quote = engine.dialect.identifier_preparer.quote
+    added = []
+    
+    with engine.begin() as connection:
+        for table in metadata.sorted_tables:
+            if not inspector.has_table(table.name):
+                continue
+            
+            existing = {column['name'] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing or not column.nullable:
+                    continue
+                
+                column_type = column.type.compile(dialect=engine.dialect)
+                connection.exec_driver_sql(
+                    f"ALTER TABLE {quote(table.name)} ADD COLUMN {quote(column.name)} {column_type}"
+                )
+                added.append(f"{table.name}.{column.name}")
+    
+    return added
+
+
+def add_missing_indexes(engine: Engine, metadata: MetaData) -> List[str]:
+    """
+    Create model indexes that are missing from existing tables.
+    
+    Safe to run on every start: indexes that already exist are skipped, as are
+    indexes over columns the table doesn't have yet. Run it after
+    add_missing_columns so indexes on newly added columns are created too.
+    
+    Args:
+        engine: Engine for the database to upgrade
+        metadata: Metadata holding the model tables
+        
+    Returns:
+        Created indexes as 'table.index' strings
+    """
+    inspector = inspect(engine)
+    created = []
+    
+    with engine.begin() as connection:
+        for table in metadata.sorted_tables:
+            if not inspector.has_table(table.name):
+                continue
+            
+            existing = {index['name'] for index in inspector.get_indexes(table.name)}
+            columns = {column['name'] for column in inspector.get_columns(table.name)}
+            for index in table.indexes:
+                if index.name in existing or not {column.name for column in index.columns} <= columns:
+                    continue
+                
+                index.create(connection, checkfirst=True)
+                created.append(f"{table.name}.{index.name}")
+    
+    return created
@@ -1,4 +1,4 @@
-from flask import Blueprint, jsonify, request
+from flask import Blueprint, current_app, jsonify, request
 from app.services.inventory_service import InventoryService
 from app.models.access_log import AccessLog
 
@@ -8,8 +8,20 @@ bp = Blueprint('api', __name__, url_prefix='/api')
 def get_data():
     """Get all listings."""
     service = InventoryService()
-    data = service.get_all_items()
-    return jsonify(data)
+    payload = service.get_all_items_payload()
+    
+    # Bytes bodies get Content-Length; the precomputed ETag lets clients revalidate with a 304
+    if request.accept_encodings['gzip']:
+        response = current_app.response_class(payload['gzip'], mimetype='application/json')
+        response.content_encoding = 'gzip'
+        response.set_etag(f"{payload['etag']}-gzip")
+    else:
+        response = current_app.response_class(payload['body'], mimetype='application/json')
+        response.set_etag(payload['etag'])
+    response.vary.add('Accept-Encoding')
+    response.cache_control.public = True
+    response.cache_control.max_age = 60
+    return response.make_conditional(request)
 
 @bp.route('/data/<int:id>')
 def get_listing_by_id(id):
@@ -237,16 +237,14 @@ def sync_discogs():
         if not seller_username:
             return jsonify({'error': 'Discogs seller username not configured'}), 400
         
-        # Initialize sync service
-        sync_service = DiscogsSyncService(
+        # Perform sync
+        current_app.logger.info("Admin triggered Discogs sync")
+        with DiscogsSyncService(
             token=token,
             seller_username=seller_username,
             user_agent=user_agent
-        )
-        
-        # Perform sync
-        current_app.logger.info("Admin triggered Discogs sync")
-        stats = sync_service.sync_all_listings()
+        ) as sync_service:
+            stats = sync_service.sync_all_listings()
         
         return jsonify({
             'success': True,
@@ -42,8 +42,7 @@ class CartService:
             return False, "Quantity must be a valid integer"
         
         # Validate listing exists
-        listing = self.inventory_service.get_item_by_listing_id(cart_item['listing_id'])
-        if not listing:
+        if not self.inventory_service.listing_exists(cart_item['listing_id']):
             return False, f"Item {cart_item['listing_id']} no longer available"
         
         return True, None
@@ -5,18 +5,120 @@ This service handles fetching listings from the Discogs API and updating
 the local database. It includes rate limiting and error handling.
 """
 
+import hashlib
+import itertools
+import orjson
+import random
 import requests
+import threading
 import time
-from datetime import datetime
-from typing import Dict, List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, Iterator, List, Optional
 from flask import current_app
-from app.extensions import db
+from sqlalchemy import delete, insert, select, update
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from app.extensions import db, cache
 from app.models.listing import Listing
+from app.services.inventory_service import InventoryService, generate_label_urls
+
+# Shared read-only default for missing nested objects in API responses
+_EMPTY: Dict = {}
+
+# Keys an API listing must have to be synced
+_REQUIRED_LISTING_FIELDS = frozenset({'id'})
+
+# Mapped column attributes of Listing, the only keys _update_listing_from_dict will set
+_LISTING_COLUMNS = frozenset(Listing.__mapper__.column_attrs.keys())
+
+# Text fields copied unchanged (defaulting to '') by DiscogsSyncService._flatten_listing
+_LISTING_TEXT_FIELDS = (
+    'status', 'condition', 'sleeve_condition', 'uri', 'resource_url',
+    'external_id', 'location', 'comments'
+)
+_RELEASE_TEXT_FIELDS = ('country', 'catalog_number', 'barcode', 'master_url')
+# (column, release key) pairs for text fields that are renamed on the way in
+_RELEASE_RENAMED_TEXT_FIELDS = (
+    ('release_title', 'title'),
+    ('release_resource_url', 'resource_url'),
+    ('release_uri', 'uri')
+)
+
+
+class TokenBucket:
+    """Thread-safe token bucket that only blocks once the burst allowance is spent."""
+    
+    def __init__(self, rate: int, period: float):
+        """
+        Initialize the bucket full.
+        
+        Args:
+            rate: Number of requests allowed per period (also the burst size)
+            period: Length of the period in seconds
+        """
+        self.capacity = float(rate)
+        self.tokens = float(rate)
+        self.fill_rate = rate / period
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def acquire(self):
+        """Take one token, sleeping until one is available."""
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self._last) * self.fill_rate)
+            self._last = now
+            
+            # Reserve the token now; a negative balance is the caller's wait
+            self.tokens -= 1
+            wait = -self.tokens / self.fill_rate if self.tokens < 0 else 0
+        
+        if wait > 0:
+            time.sleep(wait)
 
 
 class DiscogsSyncService:
     """Service for synchronizing Discogs listings with local database."""
     
+    # Pages fetched in parallel once the page count is known
+    MAX_CONCURRENT_PAGES = 5
+    
+    # Discogs allows 60 authenticated requests per minute
+    RATE_LIMIT_REQUESTS = 60
+    RATE_LIMIT_PERIOD_SECONDS = 60
+    
+    # Exponential backoff (with jitter) on HTTP 429 when there is no usable Retry-After header
+    RETRY_BACKOFF_BASE_SECONDS = 2
+    RETRY_BACKOFF_MAX_SECONDS = 60
+    
+    # Page size requested from the API, halved on server errors down to the minimum
+    MAX_PER_PAGE = 100
+    MIN_PER_PAGE = 10
+    
+    # Transient server errors retried by _fetch_page (connection errors are retried by the adapter)
+    SERVER_ERROR_RETRIES = 3
+    SERVER_ERROR_STATUSES = (500, 502, 503, 504)
+    
+    # How long page bodies are kept for conditional (If-None-Match) requests
+    PAGE_CACHE_SECONDS = 24 * 60 * 60
+    
+    # Listing IDs per DELETE statement, well under SQLite's bound-parameter limit (999 before 3.32)
+    DELETE_BATCH_SIZE = 500
+    
+    # Listing fields compared to decide whether a synced listing changed
+    CHANGE_TRACKED_FIELDS = (
+        'status', 'condition', 'sleeve_condition', 'price_value', 'price_currency',
+        'shipping_price', 'shipping_currency', 'weight', 'format_quantity',
+        'external_id', 'location', 'comments', 'release_title', 'release_year',
+        'release_resource_url', 'release_uri', 'artist_names', 'primary_artist',
+        'label_names', 'primary_label', 'format_names', 'primary_format',
+        'genres', 'styles', 'country', 'catalog_number', 'barcode', 'master_id',
+        'master_url', 'image_uri', 'image_resource_url', 'release_community_have',
+        'release_community_want'
+    )
+    
     def __init__(self, token: str, seller_username: str, user_agent: str):
         """
         Initialize the Discogs sync service.
@@ -28,11 +130,55 @@ class DiscogsSyncService:
         """
         self.base_url = "https://api.discogs.com"
         self.seller_username = seller_username
+        self.inventory_url = f"{self.base_url}/users/{seller_username}/inventory"
         self.headers = {
             "User-Agent": user_agent,
             "Accept": "application/vnd.discogs.v2.discogs+json",
             "Authorization": f"Discogs token={token}"
         }
+        self.per_page = self.MAX_PER_PAGE
+        self.fetch_complete = False
+        self._rate_limiter = TokenBucket(self.RATE_LIMIT_REQUESTS, self.RATE_LIMIT_PERIOD_SECONDS)
+        self._session = self._create_session()
+    
+    def _create_session(self) -> requests.Session:
+        """
+        Build a keep-alive session shared by all page fetches.
+        
+        The adapter only retries failed connections and reads. Status codes
+        (429s and 5xx) are never retried here, so _fetch_page alone applies the
+        rate limiter, Retry-After and page-size fallback.
+        
+        Returns:
+            Configured requests session
+        """
+        session = requests.Session()
+        session.headers.update(self.headers)
+        adapter = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=self.MAX_CONCURRENT_PAGES,
+            max_retries=Retry(
+                total=self.SERVER_ERROR_RETRIES,
+                connect=self.SERVER_ERROR_RETRIES,
+                read=self.SERVER_ERROR_RETRIES,
+                status=0,
+                respect_retry_after_header=False,
+                backoff_factor=1,
+                raise_on_status=False
+            )
+        )
+        session.mount('https://', adapter)
+        return session
+    
+    def close(self):
+        """Close the HTTP session and its pooled connections."""
+        self._session.close()
+    
+    def __enter__(self) -> 'DiscogsSyncService':
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
     
     def sync_all_listings(self) -> Dict:
         """
@@ -43,34 +189,62 @@ class DiscogsSyncService:
         """
         current_app.logger.info(f"Starting sync for seller: {self.seller_username}")
         
-        # Fetch all listings from API
-        api_listings = self._fetch_all_listings()
+        # Stream listings from the API so only the page being processed is held in memory
+        api_listings = self._iter_all_listings()
+        first_listing = next(api_listings, None)
         
-        if not api_listings:
+        if first_listing is None:
             current_app.logger.warning("No listings fetched from API")
             return {
-                'added': 0, 'updated': 0, 'removed': 0, 'total': 0,
+                'added': 0, 'updated': 0, 'removed': 0, 'skipped': 0, 'total': 0,
                 'added_listings': [], 'updated_listings': [], 'removed_listings': []
             }
         
-        # Get current listing IDs from database
-        existing_listings = {listing.listing_id: listing for listing in Listing.query.all()}
+        # Load the compared columns of every stored listing in one SELECT (rows, not ORM objects)
+        existing_listings = {
+            row.listing_id: row
+            for row in db.session.execute(
+                select(Listing.id, Listing.listing_id, Listing.content_hash, Listing.custom_metadata,
+                       *(getattr(Listing, field) for field in self.CHANGE_TRACKED_FIELDS))
+            )
+        }
         api_listing_ids = set()
         
         stats = {
-            'added': 0, 'updated': 0, 'removed': 0, 'total': len(api_listings),
+            'added': 0, 'updated': 0, 'removed': 0, 'skipped': 0, 'total': 0,
             'added_listings': [], 'updated_listings': [], 'removed_listings': []
         }
         
+        # One export timestamp for the whole sync run
+        export_timestamp = datetime.now()
+        
+        # Rows collected for bulk INSERT / UPDATE (by primary key) / DELETE
+        to_insert: List[Dict] = []
+        to_update: List[Dict] = []
+        to_rehash: List[Dict] = []
+        to_delete: List[str] = []
+        
         # Process each API listing
-        for api_listing in api_listings:
-            flattened = self._flatten_listing(api_listing)
-            listing_id = flattened.get('listing_id')
+        for api_listing in itertools.chain((first_listing,), api_listings):
+            stats['total'] += 1
             
+            # Don't flatten listings that can't be stored
+            if not _REQUIRED_LISTING_FIELDS.issubset(api_listing):
+                stats['skipped'] += 1
+                continue
+            
+            flattened = self._flatten_listing(api_listing, export_timestamp)
+            listing_id = flattened['listing_id']
             if not listing_id:
+                stats['skipped'] += 1
+                continue
+            
+            # Repeats come from inventory shifting between page requests
+            if listing_id in api_listing_ids:
                 continue
             
             api_listing_ids.add(listing_id)
+            flattened['content_hash'] = content_hash = self._content_hash(flattened)
             
             # Create listing summary for tracking
             listing_summary = {
@@ -84,22 +258,35 @@ class DiscogsSyncService:
             }
             
             if listing_id in existing_listings:
-                # Check if listing actually needs updating
                 listing = existing_listings[listing_id]
+                if listing.content_hash == content_hash:
+                    # Tracked fields are exactly as last synced
+                    continue
+                
+                # Check if listing actually needs updating
                 changed_fields = self._get_changed_fields(listing, flattened)
                 if changed_fields:
-                    self._update_listing_from_dict(listing, flattened)
+                    # Refresh label_urls without dropping other keys stored in custom_metadata
+                    metadata = {**(listing.custom_metadata or {}), **flattened['custom_metadata']}
+                    to_update.append({'id': listing.id, **flattened, 'custom_metadata': metadata})
                     stats['updated'] += 1
                     # Add changed fields to listing summary
                     listing_summary['changed_fields'] = changed_fields
                     stats['updated_listings'].append(listing_summary)
+                else:
+                    # Unchanged but hashed differently (or never hashed); store the new hash
+                    to_rehash.append({'id': listing.id, 'content_hash': content_hash})
             else:
                 # Create new listing
-                listing = Listing(**flattened)
-                db.session.add(listing)
+                to_insert.append(flattened)
                 stats['added'] += 1
                 stats['added_listings'].append(listing_summary)
         
+        # A partial fetch can't prove a listing is gone, so only remove after reading every page
+        if not self.fetch_complete:
+            current_app.logger.warning("Listing fetch was incomplete; skipping removals this sync")
+            existing_listings = {}
+        
         # Remove listings that are no longer in API response
         for listing_id, listing in existing_listings.items():
             if listing_id not in api_listing_ids:
@@ -113,13 +300,27 @@ class DiscogsSyncService:
                     'currency': listing.price_currency or '',
                     'condition': listing.condition or ''
                 }
-                db.session.delete(listing)
+                to_delete.append(listing_id)
                 stats['removed'] += 1
                 stats['removed_listings'].append(removed_summary)
         
-        # Commit all changes
+        # Write all changes as bulk statements (deletes in batches), then commit
         try:
+            if to_insert:
+                # Core insert on the table: new rows need no ORM bookkeeping
+                db.session.execute(insert(Listing.__table__), to_insert)
+            if to_update:
+                db.session.execute(update(Listing), to_update)
+            if to_rehash:
+                db.session.execute(update(Listing), to_rehash)
+            for start in range(0, len(to_delete), self.DELETE_BATCH_SIZE):
+                db.session.execute(
+                    delete(Listing)
+                    .where(Listing.listing_id.in_(to_delete[start:start + self.DELETE_BATCH_SIZE]))
+                    .execution_options(synchronize_session=False)
+                )
             db.session.commit()
+            InventoryService.invalidate_cache()
             current_app.logger.info(
                 f"Sync completed: {stats['added']} added, "
                 f"{stats['updated']} updated, {stats['removed']} removed"
@@ -138,36 +339,111 @@ class DiscogsSyncService:
         Returns:
             List of all listing dictionaries
         """
-        all_listings = []
-        page = 1
+        return list(self._iter_all_listings())
+    
+    def _iter_all_listings(self) -> Iterator[Dict]:
+        """
+        Yield all listings from Discogs API, one page at a time.
         
-        while True:
-            current_app.logger.debug(f"Fetching page {page}...")
-            
-            listings_data = self._fetch_page(page)
-            
-            if not listings_data:
-                break
-            
-            results = listings_data.get("listings", [])
-            if not results:
-                break
+        Page 1 is fetched first to learn the page count and its listings are
+        yielded before any other request is made; the remaining pages are then
+        fetched concurrently and yielded in page order. Fetching stops at the
+        first page that fails or comes back empty.
+        
+        ``self.fetch_complete`` is True once every page has been read; it stays
+        False if a page failed or the caller stopped early, so callers can tell
+        a partial listing set from the full inventory.
+        
+        Yields:
+            Listing dictionaries
+        """
+        self.fetch_complete = False
+        
+        current_app.logger.debug("Fetching page 1...")
+        first_page = self._fetch_page(1)
+        
+        listings = first_page.get("listings", []) if first_page else []
+        if not listings:
+            self.fetch_complete = first_page is not None
+            current_app.logger.info("Total listings fetched: 0")
+            return
+        
+        total = len(listings)
+        current_app.logger.debug(f"Page 1: {total} listings (Total: {total})")
+        yield from listings
+        
+        total_pages = first_page.get("pagination", {}).get("pages", 1)
+        if total_pages > 1:
+            app = current_app._get_current_object()
             
-            all_listings.extend(results)
-            current_app.logger.debug(
-                f"Page {page}: {len(results)} listings (Total: {len(all_listings)})"
-            )
+            def fetch(page: int) -> Optional[Dict]:
+                with app.app_context():
+                    return self._fetch_page(page)
             
-            # Check if there are more pages
-            pagination = listings_data.get("pagination", {})
-            if page >= pagination.get("pages", 1):
-                break
+            pages = range(2, total_pages + 1)
+            with ThreadPoolExecutor(max_workers=min(self.MAX_CONCURRENT_PAGES, len(pages))) as executor:
+                futures = [executor.submit(fetch, page) for page in pages]
+                
+                try:
+                    for page, future in zip(pages, futures):
+                        listings_data = future.result()
+                        if listings_data is None:
+                            current_app.logger.error(f"Page {page} of {total_pages} failed; listing set is incomplete")
+                            return
+                        
+                        # An empty page means the inventory shrank since page 1 was read
+                        results = listings_data.get("listings", [])
+                        if not results:
+                            break
+                        
+                        total += len(results)
+                        current_app.logger.debug(f"Page {page}: {len(results)} listings (Total: {total})")
+                        yield from results
+                finally:
+                    # Don't wait on pages past the first gap, or once the caller stops iterating
+                    for pending in futures:
+                        pending.cancel()
+        
+        self.fetch_complete = True
+        current_app.logger.info(f"Total listings fetched: {total}")
+    
+    def _retry_after_seconds(self, response: requests.Response, attempt: int) -> float:
+        """
+        Work out how long to wait after a 429 response.
+        
+        Args:
+            response: The rate-limited response
+            attempt: Number of 429s already seen for this page
             
-            page += 1
-            time.sleep(1)  # Rate limiting
+        Returns:
+            Seconds from the Retry-After header (delay or HTTP date), or a
+            jittered exponential backoff
+        """
+        retry_after = response.headers.get('Retry-After', '').strip()
+        if retry_after.isdigit():
+            return int(retry_after)
+        
+        try:
+            retry_at = parsedate_to_datetime(retry_after)
+        except (TypeError, ValueError):
+            retry_at = None
+        if retry_at is not None and retry_at.tzinfo is not None:
+            return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
         
-        current_app.logger.info(f"Total listings fetched: {len(all_listings)}")
-        return all_listings
+        return self._backoff_seconds(attempt)
+    
+    def _backoff_seconds(self, attempt: int) -> float:
+        """
+        Jittered exponential backoff for a retry.
+        
+        Args:
+            attempt: Number of retries already made
+            
+        Returns:
+            Seconds to wait, capped at RETRY_BACKOFF_MAX_SECONDS before jitter
+        """
+        backoff = min(self.RETRY_BACKOFF_MAX_SECONDS, self.RETRY_BACKOFF_BASE_SECONDS * 2 ** attempt)
+        return backoff * (0.5 + random.random())
     
     def _fetch_page(self, page: int) -> Optional[Dict]:
         """
@@ -179,55 +455,97 @@ class DiscogsSyncService:
         Returns:
             JSON response or None if error
         """
-        url = f"{self.base_url}/users/{self.seller_username}/inventory"
-        params = {
-            "status": "For Sale",
-            "per_page": 100,
-            "page": page,
-            "sort": "listed",
-            "sort_order": "desc"
-        }
+        attempt = 0
+        server_errors = 0
         
         try:
-            response = requests.get(url, headers=self.headers, params=params, timeout=10)
+            while True:
+                params = {
+                    "status": "For Sale",
+                    "per_page": self.per_page,
+                    "page": page,
+                    "sort": "listed",
+                    "sort_order": "desc"
+                }
+                
+                # Revalidate previously seen pages so unchanged ones come back as bodyless 304s
+                cache_key = f"discogs:inventory:{self.seller_username}:{self.per_page}:{page}"
+                cached = cache.get(cache_key)
+                headers = {'If-None-Match': cached[0]} if cached else None
+                
+                self._rate_limiter.acquire()
+                response = self._session.get(self.inventory_url, params=params, headers=headers, timeout=10)
+                
+                if response.status_code == 429:
+                    retry_after = self._retry_after_seconds(response, attempt)
+                    attempt += 1
+                    current_app.logger.warning(f"Rate limit exceeded, waiting {retry_after:.1f} seconds...")
+                    time.sleep(retry_after)
+                    continue
+                
+                if response.status_code in self.SERVER_ERROR_STATUSES:
+                    # Page 1 fixes the page size for the whole run, so only it may shrink it,
+                    # and only once the error repeats after a backoff at the current size
+                    if page == 1 and server_errors > 0 and self.per_page > self.MIN_PER_PAGE:
+                        wait = self._backoff_seconds(server_errors)
+                        server_errors += 1
+                        self.per_page = max(self.MIN_PER_PAGE, self.per_page // 2)
+                        current_app.logger.warning(
+                            f"Server error {response.status_code}, retrying in {wait:.1f} seconds "
+                            f"with per_page={self.per_page}"
+                        )
+                        time.sleep(wait)
+                        continue
+                    
+                    if server_errors < self.SERVER_ERROR_RETRIES:
+                        wait = self._backoff_seconds(server_errors)
+                        server_errors += 1
+                        current_app.logger.warning(
+                            f"Server error {response.status_code}, retrying in {wait:.1f} seconds..."
+                        )
+                        time.sleep(wait)
+                        continue
+                
+                break
             
             if response.status_code == 401:
                 current_app.logger.error("Authentication error: Invalid Discogs token")
                 return None
-            elif response.status_code == 429:
-                current_app.logger.warning("Rate limit exceeded, waiting 60 seconds...")
-                time.sleep(60)
-                return self._fetch_page(page)  # Retry
             elif response.status_code == 404:
                 current_app.logger.error(f"Seller '{self.seller_username}' not found")
                 return None
+            elif response.status_code == 304 and cached:
+                current_app.logger.debug(f"Page {page} not modified, using cached body")
+                return orjson.loads(cached[1])
             
             response.raise_for_status()
-            time.sleep(1)  # Basic rate limiting
             
-            return response.json()
+            data = orjson.loads(response.content)
+            etag = response.headers.get('ETag')
+            if etag:
+                cache.set(cache_key, (etag, response.content), timeout=self.PAGE_CACHE_SECONDS)
+            return data
             
-        except requests.exceptions.RequestException as e:
+        except (requests.exceptions.RequestException, orjson.JSONDecodeError) as e:
             current_app.logger.error(f"Error fetching page {page}: {e}")
             return None
     
-    def _flatten_listing(self, listing: Dict) -> Dict:
+    def _flatten_listing(self, listing: Dict, export_timestamp: Optional[datetime] = None) -> Dict:
         """
         Flatten a listing dictionary to match database schema.
         
         Args:
             listing: Single listing dictionary from API response
+            export_timestamp: Timestamp shared by the sync run (defaults to now)
             
         Returns:
             Flattened dictionary matching Listing model fields
         """
-        flattened = {}
+        # Straight text copies come from the field tables; conversions follow inline
+        flattened = {field: listing.get(field, '') for field in _LISTING_TEXT_FIELDS}
         
         # Basic listing information
         flattened['listing_id'] = str(listing.get('id', ''))
-        flattened['status'] = listing.get('status', '')
-        flattened['condition'] = listing.get('condition', '')
-        flattened['sleeve_condition'] = listing.get('sleeve_condition', '')
         
         # Parse posted date as DateTime
         posted_str = listing.get('posted', '')
@@ -239,11 +557,8 @@ class DiscogsSyncService:
         else:
             flattened['posted'] = None
         
-        flattened['uri'] = listing.get('uri', '')
-        flattened['resource_url'] = listing.get('resource_url', '')
-        
         # Price information - ensure price_value is not None
-        price = listing.get('price', {})
+        price = listing.get('price', _EMPTY)
         price_value = price.get('value')
         if price_value is not None:
             try:
@@ -255,26 +570,28 @@ class DiscogsSyncService:
         
         flattened['price_currency'] = price.get('currency', '')
         
-        shipping = listing.get('shipping_price', {})
-        flattened['shipping_price'] = float(shipping['value']) if shipping.get('value') else None
+        shipping = listing.get('shipping_price', _EMPTY)
+        shipping_value = shipping.get('value')
+        flattened['shipping_price'] = float(shipping_value) if shipping_value else None
         flattened['shipping_currency'] = shipping.get('currency', '')
         
         # Additional listing details
-        flattened['weight'] = float(listing.get('weight', 0)) if listing.get('weight') else None
-        flattened['format_quantity'] = int(listing.get('format_quantity', 0)) if listing.get('format_quantity') else None
-        flattened['external_id'] = listing.get('external_id', '')
-        flattened['location'] = listing.get('location', '')
-        flattened['comments'] = listing.get('comments', '')
+        weight = listing.get('weight')
+        flattened['weight'] = float(weight) if weight else None
+        format_quantity = listing.get('format_quantity')
+        flattened['format_quantity'] = int(format_quantity) if format_quantity else None
         
         # Release information
-        release = listing.get('release', {})
+        release = listing.get('release', _EMPTY)
         release_id = release.get('id')
         flattened['release_id'] = str(release_id) if release_id is not None else '0'
         
-        flattened['release_title'] = release.get('title', '')
-        flattened['release_year'] = int(release.get('year', 0)) if release.get('year') else None
-        flattened['release_resource_url'] = release.get('resource_url', '')
-        flattened['release_uri'] = release.get('uri', '')
+        for field, key in _RELEASE_RENAMED_TEXT_FIELDS:
+            flattened[field] = release.get(key, '')
+        for field in _RELEASE_TEXT_FIELDS:
+            flattened[field] = release.get(field, '')
+        year = release.get('year')
+        flattened['release_year'] = int(year) if year else None
         
         # Artist information
         artist = release.get('artist', '')
@@ -295,55 +612,56 @@ class DiscogsSyncService:
         styles = release.get('styles', [])
         flattened['styles'] = '; '.join(styles) if styles else ''
         
-        # Country information
-        flattened['country'] = release.get('country', '')
-        flattened['catalog_number'] = release.get('catalog_number', '')
-        flattened['barcode'] = release.get('barcode', '')
         flattened['master_id'] = str(release.get('master_id', ''))
-        flattened['master_url'] = release.get('master_url', '')
         
         # Images
-        images = release.get('images', [])
-        flattened['image_uri'] = images[0].get('uri', '') if images else ''
-        flattened['image_resource_url'] = images[0].get('resource_url', '') if images else ''
+        images = release.get('images')
+        image = images[0] if images else _EMPTY
+        flattened['image_uri'] = image.get('uri', '')
+        flattened['image_resource_url'] = image.get('resource_url', '')
         
         # Statistics
-        stats = release.get('stats', {})
-        community = stats.get('community', {})
-        flattened['release_community_have'] = int(community.get('have', 0)) if community.get('have') else None
-        flattened['release_community_want'] = int(community.get('want', 0)) if community.get('want') else None
+        community = release.get('stats', _EMPTY).get('community', _EMPTY)
+        have = community.get('have')
+        want = community.get('want')
+        flattened['release_community_have'] = int(have) if have else None
+        flattened['release_community_want'] = int(want) if want else None
 
+        # Precompute label reference URLs so detail views don't rebuild them
+        flattened['custom_metadata'] = {'label_urls': generate_label_urls(label)}
+        
         # Export timestamp
-        flattened['export_timestamp'] = datetime.now()
+        flattened['export_timestamp'] = export_timestamp or datetime.now()
         
         return flattened
     
+    def _content_hash(self, flattened: Dict) -> str:
+        """
+        Digest the change-tracked fields of a flattened listing.
+        
+        Args:
+            flattened: Listing dictionary from _flatten_listing
+            
+        Returns:
+            16-character hex digest, stored in Listing.content_hash
+        """
+        values = orjson.dumps([flattened.get(field) for field in self.CHANGE_TRACKED_FIELDS])
+        return hashlib.blake2b(values, digest_size=8).hexdigest()
+    
     def _get_changed_fields(self, listing: Listing, new_data: Dict) -> Dict[str, Dict]:
         """
         Get the fields that have changed between existing listing and new data.
         
         Args:
-            listing: Existing listing object
+            listing: Existing listing object or row with the tracked fields
             new_data: New data from API
             
         Returns:
             Dictionary of changed fields with old and new values, or empty dict if no changes
         """
-        # Key fields to compare for changes
-        key_fields = [
-            'status', 'condition', 'sleeve_condition', 'price_value', 'price_currency',
-            'shipping_price', 'shipping_currency', 'weight', 'format_quantity',
-            'external_id', 'location', 'comments', 'release_title', 'release_year',
-            'release_resource_url', 'release_uri', 'artist_names', 'primary_artist',
-            'label_names', 'primary_label', 'format_names', 'primary_format',
-            'genres', 'styles', 'country', 'catalog_number', 'barcode', 'master_id',
-            'master_url', 'image_uri', 'image_resource_url', 'release_community_have',
-            'release_community_want'
-        ]
-        
         changed_fields = {}
         
-        for field in key_fields:
+        for field in self.CHANGE_TRACKED_FIELDS:
             if field in new_data:
                 current_value = getattr(listing, field, None)
                 new_value = new_data[field]
@@ -375,11 +693,14 @@ class DiscogsSyncService:
         """
         Update a Listing object with data from dictionary.
         
+        Sync writes go through bulk UPDATE statements, so this per-object helper
+        is only used by tests and ad-hoc scripts.
+        
         Args:
             listing: Listing object to update
-            data: Dictionary with new data
+            data: Dictionary with new data; keys that aren't Listing columns are ignored
         """
         for key, value in data.items():
-            if hasattr(listing, key):
+            if key in _LISTING_COLUMNS:
                 setattr(listing, key, value)
 
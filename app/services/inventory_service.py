@@ -4,27 +4,209 @@ Inventory service for managing Discogs listings.
 This service provides methods to query and retrieve listings from the database.
 """
 
+import gzip
+import hashlib
+import re
+import orjson
 import requests
-from datetime import datetime
-from typing import List, Optional, Dict
+import urllib.parse
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Any, List, Optional, Dict, Tuple
 from flask import current_app
+from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import load_only
 from app.models.listing import Listing
 from app.models.label_info import LabelInfo
-from app.extensions import db
+from app.extensions import db, cache
+
+
+# Cache keys for query results that only change when a sync runs
+ALL_ITEMS_CACHE_KEY = 'inventory:all_items'
+ALL_ITEMS_JSON_CACHE_KEY = 'inventory:all_items_payload'
+FACETS_CACHE_KEY = 'inventory:facets'
+
+# Columns read by Listing.to_list_dict(); list endpoints load only these
+LIST_COLUMNS = (
+    Listing.id, Listing.listing_id, Listing.condition, Listing.sleeve_condition,
+    Listing.posted, Listing.price_value, Listing.price_currency,
+    Listing.release_title, Listing.release_year, Listing.artist_names,
+    Listing.primary_artist, Listing.primary_label, Listing.image_uri
+)
+
+# Reference URL templates generated for each label: (title, url, description)
+LABEL_URL_TEMPLATES = (
+    ('{prefix}Discogs Label Page',
+     'https://www.discogs.com/search/?q={quoted}&type=label',
+     'Search for {label} on Discogs'),
+    ('{prefix}Bandcamp Search',
+     'https://bandcamp.com/search?q={quoted_plus}&item_type=b',
+     'Find {label} on Bandcamp'),
+    ('{prefix}Google Search',
+     'https://www.google.com/search?q={quoted}+record+label',
+     'Search for {label} information'),
+)
+
+# Dialects with INSERT ... ON CONFLICT support for label overview upserts
+UPSERT_INSERTS = {
+    'postgresql': postgresql_insert,
+    'sqlite': sqlite_insert,
+}
+
+# YouTube video ID in watch?v=, youtu.be/ and /embed/ URIs
+_YOUTUBE_ID_RE = re.compile(r'(?:[?&]v=|youtu\.be/|/embed/)([A-Za-z0-9_-]{11})')
+
+# Labels made only of these characters encode identically without urllib
+_PLAIN_LABEL_RE = re.compile(r'[A-Za-z0-9 _.~-]*')
+
+
+def _now_utc() -> datetime:
+    """Return the current time as a timezone-aware UTC datetime."""
+    return datetime.now(timezone.utc)
+
+
+def _parse_labels(label_names: str) -> List[str]:
+    """
+    Split a comma-separated label string into unique, stripped names.
+    
+    Args:
+        label_names: Comma-separated label names
+        
+    Returns:
+        Label names in original order with blanks and duplicates removed
+    """
+    labels = []
+    seen = set()
+    for label in label_names.split(','):
+        label_clean = label.strip()
+        if label_clean and label_clean not in seen:
+            labels.append(label_clean)
+            seen.add(label_clean)
+    return labels
+
+
+def _quote_label(label: str) -> Tuple[str, str]:
+    """
+    URL-encode a label name for path-style and form-style query strings.
+    
+    Args:
+        label: Label name
+        
+    Returns:
+        Tuple of (quote, quote_plus) encodings
+    """
+    if _PLAIN_LABEL_RE.fullmatch(label):
+        return label.replace(' ', '%20'), label.replace(' ', '+')
+    return urllib.parse.quote(label), urllib.parse.quote_plus(label)
+
+
+@lru_cache(maxsize=1024)
+def _build_label_urls(label_names: str) -> Tuple[Dict, ...]:
+    """
+    Build reference URL dictionaries for every unique label in a label string.
+    
+    Args:
+        label_names: Comma-separated label names
+        
+    Returns:
+        Tuple of reference URL dictionaries (3 per label)
+    """
+    labels = _parse_labels(label_names)
+    urls = []
+    
+    for label in labels:
+        quoted, quoted_plus = _quote_label(label)
+        
+        # Add label name prefix if there are multiple labels
+        prefix = f"{label} - " if len(labels) > 1 else ""
+        
+        for title, url, description in LABEL_URL_TEMPLATES:
+            urls.append({
+                'title': title.format(prefix=prefix),
+                'url': url.format(quoted=quoted, quoted_plus=quoted_plus),
+                'description': description.format(label=label)
+            })
+    
+    return tuple(urls)
+
+
+def generate_label_urls(label_names: str) -> List[Dict]:
+    """
+    Generate reference URLs for labels. If multiple labels are present (comma-separated),
+    generates URLs for each label.
+    
+    Args:
+        label_names: Full label names string (comma-separated if multiple)
+        
+    Returns:
+        List of reference URL dictionaries (3 URLs per label)
+    """
+    if not label_names or label_names == 'Unknown':
+        return []
+    
+    # Built URLs are cached per label string; copy so callers can't mutate the cache
+    return [dict(url) for url in _build_label_urls(label_names)]
 
 
 class InventoryService:
     """Service for accessing inventory listings from database."""
     
+    @staticmethod
+    def invalidate_cache() -> None:
+        """Drop cached listings and facets so the next request re-queries."""
+        # One delete per key: cachelib's delete_many stops at the first key that isn't cached
+        for key in (ALL_ITEMS_CACHE_KEY, ALL_ITEMS_JSON_CACHE_KEY, FACETS_CACHE_KEY):
+            cache.delete(key)
+    
     def get_all_items(self) -> List[dict]:
         """
         Get all listings from database, sorted by posted date (newest first).
         
+        Results are cached until the next sync invalidates them.
+        
         Returns:
             List of listing dictionaries
         """
-        listings = Listing.query.order_by(Listing.posted.desc()).all()
-        return [listing.to_dict() for listing in listings]
+        items = cache.get(ALL_ITEMS_CACHE_KEY)
+        if items is None:
+            listings = self._list_query().order_by(Listing.posted.desc()).all()
+            items = [listing.to_list_dict() for listing in listings]
+            cache.set(ALL_ITEMS_CACHE_KEY, items)
+        return items
+    
+    def _list_query(self):
+        """
+        Build a listing query that only loads the columns used by list endpoints.
+        
+        Returns:
+            Query over Listing restricted to LIST_COLUMNS
+        """
+        return Listing.query.options(load_only(*LIST_COLUMNS))
+    
+    def get_all_items_payload(self) -> Dict[str, Any]:
+        """
+        Get all listings as a ready-to-send JSON response payload.
+        
+        The encoded body, its gzip-compressed copy and its ETag are cached
+        until the next sync, so repeated requests skip serialization,
+        compression, hashing and the query.
+        
+        Returns:
+            Dictionary with 'body' (UTF-8 JSON bytes), 'gzip' (compressed body)
+            and 'etag' (body digest)
+        """
+        payload = cache.get(ALL_ITEMS_JSON_CACHE_KEY)
+        if payload is None:
+            body = current_app.json.dumps(self.get_all_items()).encode('utf-8')
+            payload = {
+                'body': body,
+                'gzip': gzip.compress(body, compresslevel=6),
+                'etag': hashlib.sha1(body).hexdigest()
+            }
+            cache.set(ALL_ITEMS_JSON_CACHE_KEY, payload)
+        return payload
     
     def get_item_by_listing_id(self, listing_id: str) -> Optional[dict]:
         """
@@ -39,6 +221,20 @@ class InventoryService:
         listing = Listing.query.filter_by(listing_id=listing_id).first()
         return listing.to_dict() if listing else None
     
+    def listing_exists(self, listing_id: str) -> bool:
+        """
+        Check whether a listing exists without loading it.
+        
+        Args:
+            listing_id: The Discogs listing ID
+            
+        Returns:
+            True if a listing with this ID exists
+        """
+        return db.session.query(
+            Listing.query.filter_by(listing_id=listing_id).exists()
+        ).scalar()
+    
     def get_item_by_id(self, id: int) -> Optional[dict]:
         """
         Get a single listing by its database ID.
@@ -66,7 +262,7 @@ class InventoryService:
         Returns:
             List of matching listing dictionaries
         """
-        q = Listing.query
+        q = self._list_query()
         
         if query:
             q = q.filter(
@@ -84,7 +280,7 @@ class InventoryService:
             q = q.filter(Listing.format_names.ilike(f'%{format_type}%'))
         
         listings = q.order_by(Listing.posted.desc()).all()
-        return [listing.to_dict() for listing in listings]
+        return [listing.to_list_dict() for listing in listings]
     
     def get_stats(self) -> dict:
         """
@@ -93,24 +289,38 @@ class InventoryService:
         Returns:
             Dictionary with inventory statistics
         """
-        total = Listing.query.count()
+        total, last_updated = db.session.query(
+            func.count(Listing.id),
+            func.max(Listing.updated_at)
+        ).filter(Listing.is_active.is_(True)).one()
         
         return {
             'total_listings': total,
-            'last_updated': Listing.query.order_by(
-                Listing.updated_at.desc()
-            ).first().updated_at.isoformat() if total > 0 else None
+            'last_updated': last_updated.isoformat() if last_updated else None
         }
     
     def get_filter_facets(self) -> dict:
         """
         Get all unique values for filterable fields with counts.
         
+        Results are cached until the next sync invalidates them.
+        
         Returns:
             Dictionary with filter facets and their counts
         """
-        from sqlalchemy import func
+        facets = cache.get(FACETS_CACHE_KEY)
+        if facets is None:
+            facets = self._query_filter_facets()
+            cache.set(FACETS_CACHE_KEY, facets)
+        return facets
+    
+    def _query_filter_facets(self) -> dict:
+        """
+        Run the facet aggregate queries against the database.
         
+        Returns:
+            Dictionary with filter facets and their counts
+        """
         # Get unique artists with counts
         artists = Listing.query.with_entities(
             Listing.primary_artist,
@@ -191,7 +401,7 @@ class InventoryService:
         Returns:
             List of matching listing dictionaries
         """
-        q = Listing.query
+        q = self._list_query()
         
         if query:
             q = q.filter(
@@ -216,7 +426,7 @@ class InventoryService:
             q = q.filter(Listing.sleeve_condition == sleeve_condition)
         
         listings = q.order_by(Listing.posted.desc()).all()
-        return [listing.to_dict() for listing in listings]
+        return [listing.to_list_dict() for listing in listings]
 
     def get_item_with_videos(self, listing_id: str) -> Optional[Dict]:
         """
@@ -231,24 +441,8 @@ class InventoryService:
         listing = Listing.query.filter_by(listing_id=listing_id).first()
         if not listing:
             return None
-            
-        # Start with basic listing data
-        result = listing.to_dict()
         
-        # Fetch release details from Discogs API if we have a release_id
-        if listing.release_id:
-            videos = self._fetch_release_videos(listing.release_id)
-            result['videos'] = videos
-        else:
-            result['videos'] = []
-        
-        # Add label reference URLs
-        result['label_urls'] = self._generate_label_urls(listing.label_names, listing.primary_label)
-        
-        # Add AI-generated label overviews
-        result['label_overviews'] = self._get_label_overviews(listing.label_names)
-            
-        return result
+        return self._build_item_detail(listing)
     
     def get_item_with_videos_by_id(self, id: int) -> Optional[Dict]:
         """
@@ -263,7 +457,19 @@ class InventoryService:
         listing = Listing.query.get(id)
         if not listing:
             return None
+        
+        return self._build_item_detail(listing)
+    
+    def _build_item_detail(self, listing: Listing) -> Dict:
+        """
+        Build the detail payload for a listing: listing data, videos, label URLs and overviews.
+        
+        Args:
+            listing: Listing to describe
             
+        Returns:
+            Dictionary with listing data, videos, label URLs and label overviews
+        """
         # Start with basic listing data
         result = listing.to_dict()
         
@@ -274,8 +480,12 @@ class InventoryService:
         else:
             result['videos'] = []
         
-        # Add label reference URLs
-        result['label_urls'] = self._generate_label_urls(listing.label_names, listing.primary_label)
+        # Add label reference URLs, precomputed at sync time when available
+        stored_urls = (listing.custom_metadata or {}).get('label_urls')
+        if stored_urls is not None:
+            result['label_urls'] = stored_urls
+        else:
+            result['label_urls'] = self._generate_label_urls(listing.label_names, listing.primary_label)
         
         # Add AI-generated label overviews
         result['label_overviews'] = self._get_label_overviews(listing.label_names)
@@ -292,30 +502,24 @@ class InventoryService:
         Returns:
             List of video dictionaries
         """
-        headers = {
-            'User-Agent': current_app.config.get('DISCOGS_USER_AGENT', 'FreakinbeatsWebApp/1.0'),
-        }
-        
-        # Add token if available (for better rate limits)
-        token = current_app.config.get('DISCOGS_TOKEN')
-        if token:
-            headers['Authorization'] = f'Discogs token={token}'
+        # Headers (including token for better rate limits) are built in create_app
+        headers = current_app.extensions['discogs_headers']
         
         try:
             url = f'https://api.discogs.com/releases/{release_id}'
             response = requests.get(url, headers=headers, timeout=10)
             
             if response.status_code == 200:
-                data = response.json()
+                data = orjson.loads(response.content)
                 videos = data.get('videos', [])
                 
                 # Process videos to extract YouTube ID and add thumbnail
                 processed_videos = []
                 for video in videos:
                     uri = video.get('uri', '')
-                    if 'youtube.com/watch?v=' in uri:
-                        # Extract YouTube ID
-                        youtube_id = uri.split('watch?v=')[1].split('&')[0]
+                    match = _YOUTUBE_ID_RE.search(uri)
+                    if match:
+                        youtube_id = match.group(1)
                         processed_video = {
                             'title': video.get('title', ''),
                             'description': video.get('description', ''),
@@ -348,52 +552,7 @@ class InventoryService:
         Returns:
             List of reference URL dictionaries (3 URLs per label)
         """
-        import urllib.parse
-        
-        if not label_names or label_names == 'Unknown':
-            return []
-        
-        # Parse comma-separated labels and remove duplicates while preserving order
-        labels = []
-        seen = set()
-        for label in label_names.split(','):
-            label_clean = label.strip()
-            if label_clean and label_clean not in seen:
-                labels.append(label_clean)
-                seen.add(label_clean)
-        
-        if not labels:
-            return []
-        
-        urls = []
-        
-        # Generate 3 URLs for each unique label
-        for label_clean in labels:
-            label_encoded = urllib.parse.quote(label_clean)
-            label_encoded_plus = urllib.parse.quote_plus(label_clean)
-            
-            # Add label name prefix if there are multiple labels
-            label_prefix = f"{label_clean} - " if len(labels) > 1 else ""
-            
-            urls.extend([
-                {
-                    'title': f'{label_prefix}Discogs Label Page',
-                    'url': f'https://www.discogs.com/search/?q={label_encoded}&type=label',
-                    'description': f'Search for {label_clean} on Discogs'
-                },
-                {
-                    'title': f'{label_prefix}Bandcamp Search',
-                    'url': f'https://bandcamp.com/search?q={label_encoded_plus}&item_type=b',
-                    'description': f'Find {label_clean} on Bandcamp'
-                },
-                {
-                    'title': f'{label_prefix}Google Search',
-                    'url': f'https://www.google.com/search?q={label_encoded}+record+label',
-                    'description': f'Search for {label_clean} information'
-                }
-            ])
-        
-        return urls
+        return generate_label_urls(label_names)
     
     def _get_label_overviews(self, label_names: str) -> Dict[str, str]:
         """
@@ -413,13 +572,7 @@ class InventoryService:
             return {}
         
         # Parse unique labels
-        labels = []
-        seen = set()
-        for label in label_names.split(','):
-            label_clean = label.strip()
-            if label_clean and label_clean not in seen:
-                labels.append(label_clean)
-                seen.add(label_clean)
+        labels = _parse_labels(label_names)
         
         if not labels:
             return {}
@@ -427,15 +580,20 @@ class InventoryService:
         overviews = {}
         labels_to_generate = []
         
-        # Check cache for each label
+        # Check cache for all labels in one query
+        cached = {
+            label_name: overview
+            for label_name, overview in LabelInfo.query.with_entities(
+                LabelInfo.label_name, LabelInfo.overview
+            ).filter(
+                LabelInfo.label_name.in_(labels),
+                LabelInfo.cache_valid.is_(True)
+            )
+        }
+        
         for label_name in labels:
-            cached_info = LabelInfo.query.filter_by(
-                label_name=label_name,
-                cache_valid=True
-            ).first()
-            
-            if cached_info and cached_info.overview:
-                overviews[label_name] = cached_info.overview
+            if cached.get(label_name):
+                overviews[label_name] = cached[label_name]
             else:
                 labels_to_generate.append(label_name)
         
@@ -445,20 +603,22 @@ class InventoryService:
             gemini = GeminiService()
             
             if gemini.is_available():
+                generated = {}
                 for label_name in labels_to_generate:
                     try:
                         overview = gemini.generate_label_overview(label_name)
                         
                         if overview:
-                            overviews[label_name] = overview
-                            
-                            # Cache the result
-                            self._cache_label_overview(label_name, overview)
+                            generated[label_name] = overview
                         else:
                             current_app.logger.warning(f"Failed to generate overview for: {label_name}")
                             
                     except Exception as e:
                         current_app.logger.error(f"Error generating overview for {label_name}: {e}")
+                
+                # Cache all new overviews in one write
+                overviews.update(generated)
+                self._cache_label_overviews(generated)
             else:
                 current_app.logger.warning("Gemini service not available. Skipping AI overviews.")
         
@@ -472,29 +632,66 @@ class InventoryService:
             label_name: Name of the label
             overview: Generated overview text
         """
+        self._cache_label_overviews({label_name: overview})
+    
+    def _cache_label_overviews(self, overviews: Dict[str, str]) -> None:
+        """
+        Cache several label overviews with a single upsert and commit.
+        
+        Args:
+            overviews: Dictionary mapping label names to generated overview text
+        """
+        if not overviews:
+            return
+        
+        now = _now_utc()
+        rows = [
+            {
+                'label_name': label_name,
+                'overview': overview,
+                'generated_by': 'gemini-1.5-flash',
+                'generated_at': now,
+                'updated_at': now,
+                'cache_valid': True,
+                'generation_error': None
+            }
+            for label_name, overview in overviews.items()
+        ]
+        
         try:
-            # Check if entry exists
-            label_info = LabelInfo.query.filter_by(label_name=label_name).first()
+            dialect_insert = UPSERT_INSERTS.get(db.session.get_bind().dialect.name)
             
-            if label_info:
-                # Update existing
-                label_info.overview = overview
-                label_info.cache_valid = True
-                label_info.generation_error = None
-                label_info.updated_at = datetime.utcnow()
-            else:
-                # Create new
-                label_info = LabelInfo(
-                    label_name=label_name,
-                    overview=overview,
-                    generated_by='gemini-1.5-flash',
-                    cache_valid=True
+            if dialect_insert:
+                stmt = dialect_insert(LabelInfo).values(rows)
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=[LabelInfo.label_name],
+                    set_={
+                        'overview': stmt.excluded.overview,
+                        'updated_at': stmt.excluded.updated_at,
+                        'cache_valid': True,
+                        'generation_error': None
+                    }
                 )
-                db.session.add(label_info)
+                db.session.execute(stmt)
+            else:
+                # No native upsert; merge row by row but still commit once
+                existing = {
+                    info.label_name: info
+                    for info in LabelInfo.query.filter(LabelInfo.label_name.in_(overviews)).all()
+                }
+                for row in rows:
+                    label_info = existing.get(row['label_name'])
+                    if label_info:
+                        label_info.overview = row['overview']
+                        label_info.cache_valid = True
+                        label_info.generation_error = None
+                        label_info.updated_at = now
+                    else:
+                        db.session.add(LabelInfo(**row))
             
             db.session.commit()
-            current_app.logger.info(f"Cached overview for label: {label_name}")
+            current_app.logger.info(f"Cached overviews for labels: {', '.join(overviews)}")
             
         except Exception as e:
             db.session.rollback()
-            current_app.logger.error(f"Error caching overview for {label_name}: {e}")
+            current_app.logger.error(f"Error caching overviews for {', '.join(overviews)}: {e}")
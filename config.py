@@ -22,6 +22,13 @@ class Config:
         'pool_recycle': 300,
     }
     
+    # Cache settings (listings and facets only change when a sync runs).
+    # A sync only invalidates the cache it can reach, so without a shared Redis
+    # cache caching is disabled rather than left stale in other workers.
+    CACHE_REDIS_URL = os.getenv('CACHE_REDIS_URL')
+    CACHE_TYPE = os.getenv('CACHE_TYPE', 'RedisCache' if CACHE_REDIS_URL else 'NullCache')
+    CACHE_DEFAULT_TIMEOUT = 3600
+    
     # Discogs API settings
     DISCOGS_TOKEN = os.getenv('DISCOGS_TOKEN')
     DISCOGS_SELLER_USERNAME = os.getenv('DISCOGS_SELLER_USERNAME', 'freakin_beats')
@@ -9,4 +9,5 @@ if __name__ == '__main__':
     print(f"🌐 Running at: http://localhost:{Config.PORT}")
     print(f"⏹️  Press Ctrl+C to stop")
     print("=" * 50)
-    app.run(host='0.0.0.0', port=Config.PORT, debug=True)
+    # Threaded so a slow /api request doesn't block page and asset requests
+    app.run(host='0.0.0.0', port=Config.PORT, debug=True, threaded=True)
@@ -5,37 +5,97 @@ This module provides reusable fixtures for testing the Freakinbeats application,
 including Flask app context, database setup, and mock Discogs API utilities.
 """
 
+import hashlib
+import os
+import pickle
+import tempfile
+from pathlib import Path
+
 import pytest
+from sqlalchemy import event
+from sqlalchemy.orm import scoped_session, sessionmaker
+from sqlalchemy.pool import StaticPool
 from app import create_app
-from app.extensions import db as _db
+from app.extensions import cache, db as _db
+from tests.fixtures import discogs_factory as discogs_factory_module
+from tests.fixtures import tiny_fake as tiny_fake_module
 from tests.fixtures.discogs_factory import DiscogsDataFactory
 
 
+def pytest_addoption(parser):
+    """Register command line options for the test database."""
+    parser.addoption(
+        '--reuse-db', action='store_true', default=False,
+        help='Keep the test schema in a SQLite file between runs instead of in memory'
+    )
+    parser.addoption(
+        '--create-db', action='store_true', default=False,
+        help='Recreate the schema of a reused test database (use after model changes)'
+    )
+    parser.addoption(
+        '--test-tmpdir', default=_default_test_tmpdir(),
+        help='Directory for the --reuse-db database file (defaults to tmpfs when available)'
+    )
+
+
+def _default_test_tmpdir() -> str:
+    """Prefer the /dev/shm ramdisk for the reused test database, falling back to the system temp dir."""
+    shm = Path('/dev/shm')
+    if shm.is_dir():
+        return str(shm / 'freakinbeats-tests')
+    return str(Path(tempfile.gettempdir()) / 'freakinbeats-tests')
+
+
+def _test_database_uri(config) -> str:
+    """
+    Get the database URI for this test run.
+    
+    Returns:
+        A file-backed SQLite URI with --reuse-db (one file per xdist worker),
+        otherwise in-memory SQLite
+    """
+    if config.getoption('--reuse-db'):
+        test_tmpdir = Path(config.getoption('--test-tmpdir'))
+        test_tmpdir.mkdir(parents=True, exist_ok=True)
+        worker = os.environ.get('PYTEST_XDIST_WORKER', 'main')
+        return f"sqlite:///{test_tmpdir / f'freakinbeats_test_{worker}.db'}"
+    return 'sqlite:///:memory:'
+
+
 @pytest.fixture(scope='session')
-def app():
+def app(pytestconfig):
     """
     Create and configure a Flask application for testing.
     
     This fixture creates a Flask app instance with test configuration
     and yields it for use in tests.
     """
-    import os
     # Set environment variables before creating app
     os.environ['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
     os.environ['ENABLE_AUTO_SYNC'] = 'false'
     os.environ['DISCOGS_TOKEN'] = 'test_token_12345'
     os.environ['DISCOGS_SELLER_USERNAME'] = 'test_seller'
     
-    app = create_app()
-    app.config.update({
+    app = create_app({
         'TESTING': True,
-        'SQLALCHEMY_DATABASE_URI': 'sqlite:///:memory:',
+        'SQLALCHEMY_DATABASE_URI': _test_database_uri(pytestconfig),
+        # One shared connection so every checkout sees the same tables
+        'SQLALCHEMY_ENGINE_OPTIONS': {
+            'poolclass': StaticPool,
+            # Autocommit driver mode; BEGIN is emitted by SQLAlchemy so SAVEPOINTs nest properly
+            'connect_args': {'check_same_thread': False, 'isolation_level': None}
+        },
+        # Tests run in one process, so an in-process cache can't go stale
+        'CACHE_TYPE': 'SimpleCache',
         'ENABLE_AUTO_SYNC': False,  # Disable scheduler in tests
         'DISCOGS_TOKEN': 'test_token_12345',
         'DISCOGS_SELLER_USERNAME': 'test_seller',
         'DISCOGS_USER_AGENT': 'FreakinBeatsTest/1.0'
     })
     
+    with app.app_context():
+        event.listen(_db.engine, 'begin', lambda conn: conn.exec_driver_sql('BEGIN'))
+    
     yield app
 
 
@@ -44,24 +104,56 @@ def app_context(app):
     """
     Provide an application context for tests.
     
-    This fixture pushes an app context and pops it after the test.
+    This fixture pushes an app context and pops it after the test. The
+    session-scoped app shares one cache, so it is cleared for each test.
     """
     with app.app_context():
+        cache.clear()
         yield app
 
 
+@pytest.fixture(scope='session')
+def _schema(app, pytestconfig):
+    """
+    Create all tables once for the whole test session.
+    
+    Individual tests are isolated by the transaction in the db fixture,
+    so the schema itself is only built and dropped once. With --reuse-db
+    the schema is kept for the next run (--create-db rebuilds it first).
+    """
+    reuse_db = pytestconfig.getoption('--reuse-db')
+    with app.app_context():
+        if reuse_db and pytestconfig.getoption('--create-db'):
+            _db.drop_all()
+        _db.create_all()
+        yield
+        if not reuse_db:
+            _db.drop_all()
+
+
 @pytest.fixture(scope='function')
-def db(app_context):
+def db(app_context, _schema):
     """
     Provide a clean database for each test.
     
-    This fixture creates all tables before the test and drops them after.
-    Each test gets a fresh database state.
+    This fixture runs the test inside an outer transaction that is rolled
+    back afterwards. The session joins it with SAVEPOINTs, so code under
+    test can commit freely and each test still starts from an empty database.
     """
-    _db.create_all()
+    connection = _db.engine.connect()
+    transaction = connection.begin()
+    
+    original_session = _db.session
+    _db.session = scoped_session(
+        sessionmaker(bind=connection, join_transaction_mode='create_savepoint')
+    )
+    
     yield _db
+    
     _db.session.remove()
-    _db.drop_all()
+    _db.session = original_session
+    transaction.rollback()
+    connection.close()
 
 
 @pytest.fixture(scope='function')
@@ -76,7 +168,25 @@ def session(db):
     db.session.rollback()
 
 
-@pytest.fixture
+@pytest.fixture(scope='function')
+def sql_statements(db):
+    """
+    Record the leading keyword of every SQL statement the engine executes.
+    
+    Yields a list of keywords such as 'SELECT' or 'INSERT' that grows as the
+    test runs; clear it to start counting after setup writes.
+    """
+    statements = []
+    
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement.split(None, 1)[0].upper())
+    
+    event.listen(_db.engine, 'before_cursor_execute', record)
+    yield statements
+    event.remove(_db.engine, 'before_cursor_execute', record)
+
+
+@pytest.fixture(scope='session')
 def discogs_factory():
     """
     Provide a DiscogsDataFactory instance for generating mock data.
@@ -87,37 +197,72 @@ def discogs_factory():
     return DiscogsDataFactory(seed=42)
 
 
+@pytest.fixture(scope='session')
+def _mock_data_blob(request, pytestconfig):
+    """
+    Build the shared mock listings once and pickle them.
+    
+    Generation is not free, so the listing fixtures below unpickle fresh copies of
+    this prebuilt data instead of generating new listings for every test.
+    The data is also kept in pytest's cache between runs, keyed by the
+    source of the factory and its fake-text generator plus the seed, so it is
+    only regenerated when either changes (or after --cache-clear). Without the
+    cache plugin (-p no:cacheprovider) the data is generated every run.
+    
+    Returns:
+        bytes: Pickled dict with a 'listings' pool and a 'page' response
+    """
+    pytest_cache = getattr(pytestconfig, 'cache', None)
+    
+    source_hash = hashlib.sha1()
+    for module in (discogs_factory_module, tiny_fake_module):
+        source_hash.update(Path(module.__file__).read_bytes())
+    cache_key = f"freakinbeats/mock_data/{source_hash.hexdigest()}-seed42"
+    
+    data = pytest_cache.get(cache_key, None) if pytest_cache is not None else None
+    if data is None:
+        factory = request.getfixturevalue('discogs_factory')
+        data = {
+            'listings': factory.create_bulk_listings(count=256),
+            'page': factory.create_listings_page(page=1, per_page=100, total_items=250)
+        }
+        if pytest_cache is not None:
+            pytest_cache.set(cache_key, data)
+    
+    return pickle.dumps(data)
+
+
 @pytest.fixture
-def mock_listing(discogs_factory):
+def mock_listing(_mock_data_blob):
     """
     Provide a single mock Discogs listing.
     
     Returns:
         Dict: A mock listing dictionary
     """
-    return discogs_factory.create_listing()
+    return pickle.loads(_mock_data_blob)['listings'][0]
 
 
 @pytest.fixture
-def mock_listings(discogs_factory):
+def mock_listings(_mock_data_blob):
     """
     Provide multiple mock Discogs listings.
     
     Returns:
         List[Dict]: List of mock listing dictionaries
     """
-    return discogs_factory.create_bulk_listings(count=10)
+    return pickle.loads(_mock_data_blob)['listings'][:10]
 
 
 @pytest.fixture
-def mock_listings_page(discogs_factory):
+def mock_listings_page(_mock_data_blob):
     """
     Provide a paginated response of mock listings.
     
     Returns:
         Dict: A mock paginated API response
     """
-    return discogs_factory.create_listings_page(page=1, per_page=100, total_items=250)
+    return pickle.loads(_mock_data_blob)['page']
 
 
 @pytest.fixture
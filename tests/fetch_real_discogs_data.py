@@ -9,12 +9,18 @@ the response data to a JSON file. This data can then be used to:
 """
 
 import os
-import json
+import orjson
+from collections import Counter
 import requests
 from pathlib import Path
 from dotenv import load_dotenv
 
 
+def get_fixture_dir() -> Path:
+    """Directory holding real_discogs_data.json (override with FREAKIN_TEST_FIXTURE_DIR)."""
+    return Path(os.getenv('FREAKIN_TEST_FIXTURE_DIR', Path(__file__).parent / 'fixtures'))
+
+
 def fetch_real_discogs_data():
     """Fetch real data from Discogs API and save to file."""
     
@@ -44,12 +50,23 @@ def fetch_real_discogs_data():
         "sort_order": "desc"
     }
     
+    output_dir = get_fixture_dir()
+    output_file = output_dir / 'real_discogs_data.json'
+    etag_file = output_dir / 'real_discogs_data.etag'
+    
+    # Revalidate the saved sample so an unchanged inventory comes back as a bodyless 304
+    if output_file.exists() and etag_file.exists():
+        headers["If-None-Match"] = etag_file.read_text().strip()
+    
     print(f"Fetching listings from Discogs for seller: {seller_username}")
     print(f"URL: {url}")
     
     try:
         response = requests.get(url, headers=headers, params=params, timeout=10)
         
+        if response.status_code == 304:
+            print(f"\n✓ Not modified, reusing: {output_file}")
+            return orjson.loads(output_file.read_bytes())
         if response.status_code == 401:
             print("ERROR: Authentication failed. Check your DISCOGS_TOKEN")
             return
@@ -61,14 +78,17 @@ def fetch_real_discogs_data():
             return
         
         response.raise_for_status()
-        data = response.json()
+        data = orjson.loads(response.content)
         
         # Save the raw response
-        output_dir = Path(__file__).parent / 'fixtures'
-        output_file = output_dir / 'real_discogs_data.json'
+        output_dir.mkdir(parents=True, exist_ok=True)
+        
+        output_file.write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2))
         
-        with open(output_file, 'w') as f:
-            json.dump(data, f, indent=2)
+        if response.headers.get('ETag'):
+            etag_file.write_text(response.headers['ETag'])
+        elif etag_file.exists():
+            etag_file.unlink()
         
         print(f"\n✓ Successfully fetched {len(data.get('listings', []))} listings")
         print(f"✓ Saved to: {output_file}")
@@ -131,18 +151,12 @@ def analyze_field_coverage(listings):
         return
     
     # Track which fields appear in listings
-    listing_fields = {}
-    release_fields = {}
+    listing_fields = Counter()
+    release_fields = Counter()
     
     for listing in listings:
-        # Listing-level fields
-        for key in listing.keys():
-            listing_fields[key] = listing_fields.get(key, 0) + 1
-        
-        # Release-level fields
-        if 'release' in listing:
-            for key in listing['release'].keys():
-                release_fields[key] = release_fields.get(key, 0) + 1
+        listing_fields.update(listing.keys())
+        release_fields.update(listing.get('release', {}).keys())
     
     total = len(listings)
     
@@ -165,14 +179,13 @@ def compare_with_mock_factory():
     print("\n=== Comparing with Mock Factory ===")
     
     # Try to load real data
-    real_data_file = Path(__file__).parent / 'fixtures' / 'real_discogs_data.json'
+    real_data_file = get_fixture_dir() / 'real_discogs_data.json'
     
     if not real_data_file.exists():
         print("No real data file found. Run fetch first.")
         return
     
-    with open(real_data_file, 'r') as f:
-        real_data = json.load(f)
+    real_data = orjson.loads(real_data_file.read_bytes())
     
     if not real_data.get('listings'):
         print("No listings in real data")
@@ -186,9 +199,9 @@ def compare_with_mock_factory():
         
         real_listing = real_data['listings'][0]
         
-        # Compare top-level keys
-        real_keys = set(real_listing.keys())
-        mock_keys = set(mock_listing.keys())
+        # Compare top-level keys (dict_keys views support set operations directly)
+        real_keys = real_listing.keys()
+        mock_keys = mock_listing.keys()
         
         print("\nTop-level listing keys:")
         print(f"  Real keys: {len(real_keys)}")
@@ -206,8 +219,8 @@ def compare_with_mock_factory():
         
         # Compare release keys
         if 'release' in real_listing and 'release' in mock_listing:
-            real_release_keys = set(real_listing['release'].keys())
-            mock_release_keys = set(mock_listing['release'].keys())
+            real_release_keys = real_listing['release'].keys()
+            mock_release_keys = mock_listing['release'].keys()
             
             print("\nRelease keys:")
             print(f"  Real keys: {len(real_release_keys)}")
@@ -244,5 +257,5 @@ if __name__ == '__main__':
     compare_with_mock_factory()
     
     print("\n" + "=" * 70)
-    print("Done! Check tests/fixtures/real_discogs_data.json for the raw data")
+    print(f"Done! Check {get_fixture_dir() / 'real_discogs_data.json'} for the raw data")
     print("=" * 70)
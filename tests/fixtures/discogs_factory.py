@@ -5,24 +5,62 @@ This module provides utilities for creating realistic test data
 that mimics the structure of Discogs API responses.
 """
 
+import itertools
 import random
-from faker import Faker
 from typing import Dict, List, Optional
+from tests.fixtures.tiny_fake import TinyFake
+
+# Option pools drawn from when generating listings and releases
+CONDITIONS = (
+    'Mint (M)', 'Near Mint (NM or M-)', 'Very Good Plus (VG+)',
+    'Very Good (VG)', 'Good Plus (G+)', 'Good (G)'
+)
+FORMATS = ('Vinyl', 'LP', '12"', '7"', 'CD', 'Cassette')
+GENRES = (
+    'Rock', 'Electronic', 'Jazz', 'Funk / Soul', 'Pop',
+    'Hip Hop', 'Classical', 'Reggae', 'Blues', 'Folk, World, & Country'
+)
+STYLES = (
+    'Alternative Rock', 'Indie Rock', 'House', 'Techno', 'Disco',
+    'Funk', 'Soul', 'Punk', 'Post-Punk', 'Experimental'
+)
+COUNTRIES = ('US', 'UK', 'Germany', 'Japan', 'France', 'Canada', 'Italy')
+
+# Number of fake text values prebuilt per field
+POOL_SIZE = 512
+
 
 class DiscogsDataFactory:
     """Factory for generating mock Discogs listing data."""
     
+    __slots__ = ('fake', 'rng', '_counter', '_posted', '_cities', '_names', '_companies', '_titles')
+    
     def __init__(self, seed: Optional[int] = 42):
         """
-        Initialize the factory with a Faker instance.
+        Initialize the factory with a fake-text generator.
         
         Args:
             seed: Random seed for reproducible test data
         """
-        self.fake = Faker()
-        if seed is not None:
-            Faker.seed(seed)
-            random.seed(seed)
+        self.fake = TinyFake(seed)
+        # Own RNG so draws don't depend on (or disturb) the global random state
+        self.rng = random.Random(seed)
+        
+        # Generate text pools once and cycle through them
+        self._counter = itertools.count()
+        self._posted = [self.fake.iso8601() for _ in range(POOL_SIZE)]
+        self._cities = [self.fake.city() for _ in range(POOL_SIZE)]
+        self._names = [self.fake.name() for _ in range(POOL_SIZE)]
+        self._companies = [self.fake.company() for _ in range(POOL_SIZE)]
+        self._titles = [self.fake.catch_phrase() for _ in range(POOL_SIZE)]
+    
+    def _next(self) -> int:
+        """Return the next value of the factory's running counter."""
+        return next(self._counter)
+    
+    def _pick(self, pool: List[str]) -> str:
+        """Return the next value from a prebuilt text pool."""
+        return pool[self._next() % POOL_SIZE]
     
     def create_listing(self, **overrides) -> Dict:
         """
@@ -34,80 +72,66 @@ class DiscogsDataFactory:
         Returns:
             Dictionary representing a Discogs listing
         """
-        listing_id = overrides.get('id', self.fake.random_int(min=100000, max=999999999))
+        listing_id = overrides.get('id', self.rng.randint(100000, 999999999))
         
         listing = {
             'id': listing_id,
             'status': overrides.get('status', 'For Sale'),
-            'condition': overrides.get('condition', random.choice([
-                'Mint (M)', 'Near Mint (NM or M-)', 'Very Good Plus (VG+)',
-                'Very Good (VG)', 'Good Plus (G+)', 'Good (G)'
-            ])),
-            'sleeve_condition': overrides.get('sleeve_condition', random.choice([
-                'Mint (M)', 'Near Mint (NM or M-)', 'Very Good Plus (VG+)',
-                'Very Good (VG)', 'Good Plus (G+)', 'Good (G)'
-            ])),
-            'posted': overrides.get('posted', self.fake.iso8601()),
+            'condition': overrides.get('condition', self.rng.choice(CONDITIONS)),
+            'sleeve_condition': overrides.get('sleeve_condition', self.rng.choice(CONDITIONS)),
+            'posted': overrides.get('posted', self._pick(self._posted)),
             'uri': overrides.get('uri', f'/sell/item/{listing_id}'),
             'resource_url': overrides.get('resource_url', 
                 f'https://api.discogs.com/marketplace/listings/{listing_id}'),
             'price': {
-                'value': overrides.get('price_value', round(random.uniform(5.0, 150.0), 2)),
+                'value': overrides.get('price_value', round(self.rng.uniform(5.0, 150.0), 2)),
                 'currency': overrides.get('price_currency', 'USD')
             }, 
             'shipping_price': {
-                'value': overrides.get('shipping_price', round(random.uniform(3.0, 10.0), 2)),
+                'value': overrides.get('shipping_price', round(self.rng.uniform(3.0, 10.0), 2)),
                 'currency': overrides.get('shipping_currency', 'USD')
             },
-            'weight': overrides.get('weight', round(random.uniform(150, 250), 1)),
+            'weight': overrides.get('weight', round(self.rng.uniform(150, 250), 1)),
             'format_quantity': overrides.get('format_quantity', 1),
             'external_id': overrides.get('external_id', ''),
-            'location': overrides.get('location', self.fake.city()),
+            'location': overrides.get('location', self._pick(self._cities)),
             'comments': overrides.get('comments', ''),
             'release': self._create_release(**overrides.get('release', {}))
         }
         # Apply any additional overrides
-        for key, value in overrides.items():
-            if key not in listing and key != 'release':
-                listing[key] = value
+        if overrides:
+            listing.update({key: overrides[key] for key in overrides.keys() - listing.keys() - {'release'}})
         
         return listing
     
     def _create_release(self, **overrides) -> Dict:
         """Create a mock release object."""
-        release_id = overrides.get('id', self.fake.random_int(min=1000, max=9999999))
+        release_id = overrides.get('id', self.rng.randint(1000, 9999999))
         
-        artist_name = overrides.get('artist', self.fake.name())
-        label_name = overrides.get('label', f'{self.fake.company()} Records')
-        format_name = overrides.get('format', random.choice([
-            'Vinyl', 'LP', '12"', '7"', 'CD', 'Cassette'
-        ]))
+        artist_name = overrides.get('artist', self._pick(self._names))
+        label_name = overrides.get('label', f'{self._pick(self._companies)} Records')
+        format_name = overrides.get('format', self.rng.choice(FORMATS))
         
         # Generate genre and style
-        genres = overrides.get('genres', random.sample([
-            'Rock', 'Electronic', 'Jazz', 'Funk / Soul', 'Pop',
-            'Hip Hop', 'Classical', 'Reggae', 'Blues', 'Folk, World, & Country'
-        ], k=random.randint(1, 2)))
+        genres = overrides.get('genres', self.rng.sample(GENRES, k=self.rng.randint(1, 2)))
         
-        styles = overrides.get('styles', random.sample([
-            'Alternative Rock', 'Indie Rock', 'House', 'Techno', 'Disco',
-            'Funk', 'Soul', 'Punk', 'Post-Punk', 'Experimental'
-        ], k=random.randint(0, 2)))  # Styles can be empty
+        styles = overrides.get('styles', self.rng.sample(STYLES, k=self.rng.randint(0, 2)))  # Styles can be empty
         
         # Generate image data
+        image_seed = self._next()
         images = overrides.get('images', [{
             'type': 'primary',
-            'uri': self.fake.image_url(),
-            'resource_url': self.fake.image_url(),
-            'uri150': self.fake.image_url(width=150),
+            'uri': f'https://picsum.photos/seed/{image_seed}/600/600',
+            'resource_url': f'https://picsum.photos/seed/{image_seed}/600/600',
+            'uri150': f'https://picsum.photos/seed/{image_seed}/150/150',
             'width': 600,
             'height': 600
         }])
         
         release = {
             'id': release_id,
-            'title': overrides.get('title', self.fake.catch_phrase()),
-            'year': overrides.get('year', random.randint(1960, 2024)),
+            'title': overrides.get('title', self._pick(self._titles)),
+            'year': overrides.get('year', self.rng.randint(1960, 2024)),
             'resource_url': overrides.get('resource_url',
                 f'https://api.discogs.com/releases/{release_id}'),
             'uri': overrides.get('uri', f'/release/{release_id}'),
@@ -116,28 +140,25 @@ class DiscogsDataFactory:
             'format': format_name,
             'genres': genres,
             'styles': styles,
-            'country': overrides.get('country', random.choice([
-                'US', 'UK', 'Germany', 'Japan', 'France', 'Canada', 'Italy'
-            ])),
+            'country': overrides.get('country', self.rng.choice(COUNTRIES)),
             'catalog_number': overrides.get('catalog_number', 
-                self.fake.bothify(text='???-####')),
+                f'CAT-{self._next():04d}'),
             'barcode': overrides.get('barcode', ''),
-            'master_id': overrides.get('master_id', self.fake.random_int(min=1000, max=999999)),
+            'master_id': overrides.get('master_id', self.rng.randint(1000, 999999)),
             'master_url': overrides.get('master_url',
-                f'https://api.discogs.com/masters/{self.fake.random_int(min=1000, max=999999)}'),
+                f'https://api.discogs.com/masters/{self.rng.randint(1000, 999999)}'),
             'images': images,
             'stats': {
                 'community': {
-                    'have': random.randint(10, 5000),
-                    'want': random.randint(5, 2000)
+                    'have': self.rng.randint(10, 5000),
+                    'want': self.rng.randint(5, 2000)
                 }
             }
         }
         
         # Apply any additional overrides
-        for key, value in overrides.items():
-            if key not in release:
-                release[key] = value
+        if overrides:
+            release.update({key: overrides[key] for key in overrides.keys() - release.keys()})
         
         return release
     
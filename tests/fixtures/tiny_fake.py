@@ -0,0 +1,75 @@
+"""
+Minimal deterministic fake-data generator for the mock Discogs factory.
+
+Covers only the handful of values DiscogsDataFactory needs, so tests don't
+pay Faker's import and provider overhead.
+"""
+
+import random
+from datetime import datetime, timedelta
+from typing import Optional
+
+FIRST_NAMES = (
+    'Alice', 'Andre', 'Beatriz', 'Carl', 'Chioma', 'Dana', 'Dmitri', 'Elena',
+    'Femi', 'Grace', 'Hiro', 'Ines', 'Jamal', 'Jonas', 'Kara', 'Luca',
+    'Maya', 'Nils', 'Omar', 'Priya', 'Quinn', 'Rosa', 'Sam', 'Tariq',
+    'Uma', 'Victor', 'Wen', 'Ximena', 'Yusuf', 'Zoe'
+)
+LAST_NAMES = (
+    'Adams', 'Baker', 'Costa', 'Dubois', 'Evans', 'Fischer', 'Garcia', 'Hughes',
+    'Ito', 'Jensen', 'Kowalski', 'Lopez', 'Moreau', 'Nakamura', 'Okafor', 'Park',
+    'Quint', 'Rossi', 'Schmidt', 'Tanaka', 'Usman', 'Vargas', 'Walker', 'Xu',
+    'Young', 'Zimmer'
+)
+COMPANY_SUFFIXES = ('Sound', 'Audio', 'Music', 'Grooves', 'Tapes', 'Sonic', 'Wax', 'Recordings')
+TITLE_WORDS = (
+    'Midnight', 'Electric', 'Golden', 'Velvet', 'Silent', 'Neon', 'Lost', 'Broken',
+    'Echoes', 'Horizons', 'Dreams', 'Rhythms', 'Signals', 'Waves', 'Shadows', 'Lights',
+    'Deep', 'Static', 'Solar', 'Paper', 'Frequencies', 'Gardens', 'Machines', 'Rivers'
+)
+CITIES = (
+    'Amsterdam', 'Berlin', 'Bristol', 'Chicago', 'Detroit', 'Glasgow', 'Kingston',
+    'Lagos', 'Leeds', 'Lisbon', 'London', 'Los Angeles', 'Manchester', 'Melbourne',
+    'Montreal', 'Nashville', 'New York', 'Osaka', 'Paris', 'Portland', 'Seattle',
+    'Sheffield', 'Stockholm', 'Tokyo', 'Toronto', 'Vienna'
+)
+
+# Posted dates are drawn between these points
+_EPOCH = datetime(1970, 1, 1)
+_LATEST_SECONDS = int((datetime(2024, 12, 31) - _EPOCH).total_seconds())
+
+
+class TinyFake:
+    """Seeded stand-in for the few Faker providers the mock factory uses."""
+
+    __slots__ = ('rng',)
+
+    def __init__(self, seed: Optional[int] = None):
+        """
+        Initialize the generator.
+
+        Args:
+            seed: Random seed for reproducible output
+        """
+        self.rng = random.Random(seed)
+
+    def name(self) -> str:
+        """Return a person's full name."""
+        return f'{self.rng.choice(FIRST_NAMES)} {self.rng.choice(LAST_NAMES)}'
+
+    def company(self) -> str:
+        """Return a company name."""
+        return f'{self.rng.choice(LAST_NAMES)} {self.rng.choice(COMPANY_SUFFIXES)}'
+
+    def catch_phrase(self) -> str:
+        """Return a short title-like phrase."""
+        first, second = self.rng.sample(TITLE_WORDS, k=2)
+        return f'{first} {second}'
+
+    def city(self) -> str:
+        """Return a city name."""
+        return self.rng.choice(CITIES)
+
+    def iso8601(self) -> str:
+        """Return a naive ISO 8601 timestamp between 1970 and 2024."""
+        return (_EPOCH + timedelta(seconds=self.rng.randint(0, _LATEST_SECONDS))).isoformat()
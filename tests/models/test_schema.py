@@ -0,0 +1,89 @@
+"""
+Unit tests for in-place schema upgrades.
+
+This module tests add_missing_columns and add_missing_indexes against
+databases created before a model gained new columns or indexes.
+"""
+
+from sqlalchemy import create_engine, inspect
+
+from app.extensions import db
+from app.models.listing import Listing
+from app.models.schema import add_missing_columns, add_missing_indexes
+
+
+def _legacy_engine():
+    """Create an in-memory database whose listings table predates content_hash."""
+    engine = create_engine('sqlite://')
+    with engine.begin() as connection:
+        connection.exec_driver_sql(
+            'CREATE TABLE listings ('
+            'id INTEGER PRIMARY KEY, listing_id VARCHAR(50) NOT NULL, '
+            'release_id VARCHAR(50) NOT NULL, price_value FLOAT NOT NULL)'
+        )
+        connection.exec_driver_sql(
+            "INSERT INTO listings (listing_id, release_id, price_value) VALUES ('1', '1', 5.0)"
+        )
+    return engine
+
+
+class TestAddMissingColumns:
+    """Test the add_missing_columns function."""
+    
+    def test_adds_new_nullable_columns(self, app_context):
+        """Test that nullable model columns are added to an existing table."""
+        engine = _legacy_engine()
+        
+        added = add_missing_columns(engine, db.metadata)
+        
+        columns = {column['name'] for column in inspect(engine).get_columns('listings')}
+        assert 'listings.content_hash' in added
+        assert 'content_hash' in columns
+        # NOT NULL columns can't be added to rows that already exist
+        assert 'listings.is_active' not in added
+        assert not Listing.__table__.c.is_active.nullable
+    
+    def test_is_idempotent(self, app_context):
+        """Test that a second run adds nothing and keeps existing rows."""
+        engine = _legacy_engine()
+        add_missing_columns(engine, db.metadata)
+        
+        assert add_missing_columns(engine, db.metadata) == []
+        with engine.connect() as connection:
+            assert connection.exec_driver_sql('SELECT content_hash FROM listings').fetchall() == [(None,)]
+    
+    def test_skips_missing_tables(self, app_context):
+        """Test that tables create_all hasn't made yet are left alone."""
+        engine = create_engine('sqlite://')
+        
+        assert add_missing_columns(engine, db.metadata) == []
+
+
+class TestAddMissingIndexes:
+    """Test the add_missing_indexes function."""
+    
+    def test_creates_missing_indexes(self, app_context):
+        """Test that model indexes are created on an existing table, then skipped."""
+        engine = create_engine('sqlite://')
+        with engine.begin() as connection:
+            connection.exec_driver_sql(
+                'CREATE TABLE listings ('
+                'id INTEGER PRIMARY KEY, listing_id VARCHAR(50) NOT NULL, '
+                'is_active BOOLEAN NOT NULL DEFAULT 1, updated_at DATETIME)'
+            )
+        
+        created = add_missing_indexes(engine, db.metadata)
+        
+        indexes = {index['name'] for index in inspect(engine).get_indexes('listings')}
+        assert 'listings.ix_listings_active_updated' in created
+        assert {'ix_listings_active_updated', 'ix_listings_listing_id'} <= indexes
+        assert add_missing_indexes(engine, db.metadata) == []
+    
+    def test_skips_indexes_on_missing_columns(self, app_context):
+        """Test that indexes over columns the table lacks are not attempted."""
+        engine = _legacy_engine()
+        
+        created = add_missing_indexes(engine, db.metadata)
+        
+        assert 'listings.ix_listings_active_updated' not in created
+        assert 'listings.ix_listings_listing_id' in created
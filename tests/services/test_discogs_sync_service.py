@@ -14,6 +14,7 @@ import responses
 from unittest.mock import Mock, patch, call
 from datetime import datetime
 from freezegun import freeze_time
+from sqlalchemy import text
 
 from app.services.discogs_sync_service import DiscogsSyncService
 from app.models.listing import Listing
@@ -32,10 +33,43 @@ class TestDiscogsSyncServiceInit:
         
         assert service.base_url == 'https://api.discogs.com'
         assert service.seller_username == 'test_user'
+        assert service.inventory_url == 'https://api.discogs.com/users/test_user/inventory'
         assert 'TestAgent/1.0' in service.headers['User-Agent']
         assert 'Discogs token=test_token' in service.headers['Authorization']
         assert service.headers['Accept'] == 'application/vnd.discogs.v2.discogs+json'
 
+    def test_init_creates_authenticated_session(self, app_context):
+        """Test that the shared session carries the API headers."""
+        service = DiscogsSyncService(
+            token='test_token',
+            seller_username='test_user',
+            user_agent='TestAgent/1.0'
+        )
+
+        assert service._session.headers['Authorization'] == 'Discogs token=test_token'
+        max_retries = service._session.get_adapter('https://api.discogs.com').max_retries
+        assert max_retries.total == 3
+        # Status codes are left to _fetch_page
+        assert max_retries.status == 0
+        assert not max_retries.status_forcelist
+        assert not max_retries.respect_retry_after_header
+
+    @responses.activate
+    def test_session_reused_and_closed(self, sync_service, mock_listings_page):
+        """Test that page fetches share one session, closed when the service is."""
+        url = f"{sync_service.base_url}/users/{sync_service.seller_username}/inventory"
+        responses.add(responses.GET, url, json=mock_listings_page, status=200)
+        session = sync_service._session
+        
+        with patch.object(session, 'close') as mock_close:
+            with sync_service as service:
+                service._fetch_page(1)
+                service._fetch_page(2)
+            
+            assert service._session is session
+            mock_close.assert_called_once()
+        assert len(responses.calls) == 2
+
 
 class TestFetchPage:
     """Test the _fetch_page method."""
@@ -103,17 +137,129 @@ class TestFetchPage:
         url = f"{sync_service.base_url}/users/{sync_service.seller_username}/inventory"
         
         # First call returns 429, second succeeds
+        responses.add(responses.GET, url, status=429, headers={'Retry-After': '2'})
+        responses.add(responses.GET, url, json=mock_listings_page, status=200)
+        
+        result = sync_service._fetch_page(1)
+        
+        assert result is not None
+        assert len(responses.calls) == 2
+        mock_sleep.assert_called_once_with(2)  # Should wait as long as Retry-After asks
+    
+    @responses.activate
+    @patch('time.sleep')
+    def test_fetch_page_429_backs_off_without_retry_after(self, mock_sleep, sync_service, mock_listings_page):
+        """Test jittered exponential backoff when no Retry-After header is sent."""
+        url = f"{sync_service.base_url}/users/{sync_service.seller_username}/inventory"
+        base = sync_service.RETRY_BACKOFF_BASE_SECONDS
+        
+        responses.add(responses.GET, url, status=429)
         responses.add(responses.GET, url, status=429)
         responses.add(responses.GET, url, json=mock_listings_page, status=200)
         
         result = sync_service._fetch_page(1)
         
+        assert result is not None
+        first_wait, second_wait = [args[0] for args, _ in mock_sleep.call_args_list]
+        assert base / 2 <= first_wait <= base * 2
+        assert base <= second_wait <= base * 4
+    
+    @responses.activate
+    @patch('time.sleep')
+    def test_fetch_page_429_honours_retry_after(self, mock_sleep, sync_service, mock_listings_page):
+        """Test that the Retry-After header sets the rate limit wait."""
+        url = f"{sync_service.base_url}/users/{sync_service.seller_username}/inventory"
+        
+        responses.add(responses.GET, url, status=429, headers={'Retry-After': '7'})
+        responses.add(responses.GET, url, json=mock_listings_page, status=200)
+        
+        result = sync_service._fetch_page(1)
+        
+        assert result is not None
+        mock_sleep.assert_any_call(7)
+        assert call(60) not in mock_sleep.call_args_list
+
+    @responses.activate
+    @patch('time.sleep')
+    @freeze_time('2024-01-01 12:00:00')
+    def test_fetch_page_429_honours_retry_after_date(self, mock_sleep, sync_service, mock_listings_page):
+        """Test that an HTTP-date Retry-After header waits until that time."""
+        url = f"{sync_service.base_url}/users/{sync_service.seller_username}/inventory"
+        
+        responses.add(responses.GET, url, status=429,
+                      headers={'Retry-After': 'Mon, 01 Jan 2024 12:00:15 GMT'})
+        responses.add(responses.GET, url, json=mock_listings_page, status=200)
+        
+        result = sync_service._fetch_page(1)
+        
         assert result is not None
         assert len(responses.calls) == 2
-        mock_sleep.assert_any_call(60)  # Should wait 60 seconds
+        mock_sleep.assert_called_once_with(15.0)
+
+    @responses.activate
+    @patch('time.sleep')
+    def test_fetch_page_retries_server_errors_then_gives_up(self, mock_sleep, sync_service):
+        """Test that 5xx responses on later pages are retried a bounded number of times."""
+        url = f"{sync_service.base_url}/users/{sync_service.seller_username}/inventory"
+        responses.add(responses.GET, url, status=503)
+        
+        result = sync_service._fetch_page(2)
+        
+        assert result is None
+        assert len(responses.calls) == sync_service.SERVER_ERROR_RETRIES + 1
+        assert mock_sleep.call_count == sync_service.SERVER_ERROR_RETRIES
+        assert sync_service.per_page == sync_service.MAX_PER_PAGE
+
+    @responses.activate
+    def test_fetch_page_304_uses_cached_body(self, sync_service, mock_listings_page):
+        """Test that an unchanged page is revalidated and served from cache."""
+        url = f"{sync_service.base_url}/users/{sync_service.seller_username}/inventory"
+
+        responses.add(responses.GET, url, json=mock_listings_page, status=200, headers={'ETag': '"v1"'})
+        responses.add(responses.GET, url, status=304)
+
+        first = sync_service._fetch_page(9)
+        second = sync_service._fetch_page(9)
+
+        assert second == first
+        assert responses.calls[1].request.headers['If-None-Match'] == '"v1"'
+
+    @responses.activate
+    @patch('time.sleep')
+    def test_fetch_page_retries_page_one_before_halving(self, mock_sleep, sync_service, mock_listings_page):
+        """Test that a single 5xx on page 1 is retried at full size after a backoff."""
+        url = f"{sync_service.base_url}/users/{sync_service.seller_username}/inventory"
+
+        responses.add(responses.GET, url, status=502)
+        responses.add(responses.GET, url, json=mock_listings_page, status=200)
+
+        result = sync_service._fetch_page(1)
+
+        assert result is not None
+        assert [c.request.params['per_page'] for c in responses.calls] == ['100', '100']
+        assert mock_sleep.call_count == 1
+        assert sync_service.per_page == sync_service.MAX_PER_PAGE
+
+    @responses.activate
+    @patch('time.sleep')
+    def test_fetch_page_halves_per_page_on_server_error(self, mock_sleep, sync_service, mock_listings_page):
+        """Test that a 5xx repeating on page 1 after a backoff retries with a smaller page size."""
+        url = f"{sync_service.base_url}/users/{sync_service.seller_username}/inventory"
+
+        responses.add(responses.GET, url, status=500)
+        responses.add(responses.GET, url, status=500)
+        responses.add(responses.GET, url, json=mock_listings_page, status=200)
+
+        result = sync_service._fetch_page(1)
+
+        assert result is not None
+        assert [c.request.params['per_page'] for c in responses.calls] == ['100', '100', '50']
+        assert mock_sleep.call_count == 2
+        assert sync_service.per_page == 50
+
 
 class TestFetchAllListings:
-    """Test the _fetch_all_listings method."""
+    """Test the _fetch_all_listings and _iter_all_listings methods."""
     
     @responses.activate
     @patch('time.sleep')
@@ -184,7 +330,75 @@ class TestFetchAllListings:
         assert len(results) == 0
     
     @responses.activate
-    def test_fetch_all_listings_api_error(self, sync_service):
+    @patch('time.sleep')
+    def test_fetch_all_listings_keeps_page_order(self, mock_sleep, sync_service, discogs_factory):
+        """Test that concurrently fetched pages are returned in page order."""
+        url = f"{sync_service.base_url}/users/{sync_service.seller_username}/inventory"
+        pages = {
+            page: discogs_factory.create_listings_page(page=page, per_page=100, total_items=250)
+            for page in (1, 2, 3)
+        }
+        
+        def page_callback(request):
+            return (200, {}, json.dumps(pages[int(request.params['page'])]))
+        
+        responses.add_callback(responses.GET, url, callback=page_callback)
+        
+        results = sync_service._fetch_all_listings()
+        
+        expected_ids = [listing['id'] for page in (1, 2, 3) for listing in pages[page]['listings']]
+        assert [listing['id'] for listing in results] == expected_ids
+    
+    @responses.activate
+    @patch('time.sleep')
+    def test_fetch_all_listings_stops_at_failed_page(self, mock_sleep, sync_service, discogs_factory):
+        """Test that pages after a failed page are discarded."""
+        url = f"{sync_service.base_url}/users/{sync_service.seller_username}/inventory"
+        pages = {
+            page: discogs_factory.create_listings_page(page=page, per_page=100, total_items=250)
+            for page in (1, 3)
+        }
+        
+        def page_callback(request):
+            page = int(request.params['page'])
+            if page == 2:
+                return (404, {}, '')
+            return (200, {}, json.dumps(pages[page]))
+        
+        responses.add_callback(responses.GET, url, callback=page_callback)
+        
+        results = sync_service._fetch_all_listings()
+        
+        assert len(results) == 100
+        assert sync_service.fetch_complete is False
+    
+    @responses.activate
+    @patch('time.sleep')
+    def test_iter_all_listings_is_lazy(self, mock_sleep, sync_service, discogs_factory):
+        """Test that later pages are not requested until page 1 has been consumed."""
+        url = f"{sync_service.base_url}/users/{sync_service.seller_username}/inventory"
+        pages = {
+            page: discogs_factory.create_listings_page(page=page, per_page=100, total_items=250)
+            for page in (1, 2, 3)
+        }
+        
+        def page_callback(request):
+            return (200, {}, json.dumps(pages[int(request.params['page'])]))
+        
+        responses.add_callback(responses.GET, url, callback=page_callback)
+        
+        listings = sync_service._iter_all_listings()
+        first = next(listings)
+        
+        assert first['id'] == pages[1]['listings'][0]['id']
+        assert len(responses.calls) == 1
+        
+        assert len(list(listings)) == 249
+        assert len(responses.calls) == 3
+    
+    @responses.activate
+    @patch('time.sleep')
+    def test_fetch_all_listings_api_error(self, mock_sleep, sync_service):
         """Test handling of API errors during fetch."""
         url = f"{sync_service.base_url}/users/{sync_service.seller_username}/inventory"
         responses.add(responses.GET, url, status=500)
@@ -256,6 +470,32 @@ class TestSyncAllListings:
         assert updated.price_value == 15.0
         assert updated.artist_names == 'New Artist'
     
+    @responses.activate
+    @patch('time.sleep')
+    def test_sync_update_preserves_custom_metadata(self, mock_sleep, sync_service, db, discogs_factory):
+        """Test that updating a listing refreshes label_urls but keeps other metadata keys."""
+        listing = Listing(
+            listing_id='12345', release_id='100', price_value=10.0,
+            custom_metadata={'notes': 'signed copy', 'label_urls': []}
+        )
+        db.session.add(listing)
+        db.session.commit()
+        
+        url = f"{sync_service.base_url}/users/{sync_service.seller_username}/inventory"
+        page_data = discogs_factory.create_listings_page(
+            page=1, per_page=100, total_items=1, id=12345, price_value=15.0,
+            release={'label': 'Blue Note'}
+        )
+        responses.add(responses.GET, url, json=page_data, status=200)
+        
+        stats = sync_service.sync_all_listings()
+        
+        assert stats['updated'] == 1
+        db.session.expire_all()
+        metadata = Listing.query.filter_by(listing_id='12345').one().custom_metadata
+        assert metadata['notes'] == 'signed copy'
+        assert len(metadata['label_urls']) == 3
+    
     @responses.activate
     @patch('time.sleep')
     def test_sync_removes_delisted_items(self, mock_sleep, sync_service, db, discogs_factory):
@@ -284,6 +524,30 @@ class TestSyncAllListings:
         assert stats['removed'] == 1
         assert Listing.query.count() == 1
     
+    @responses.activate
+    @patch('time.sleep')
+    def test_sync_keeps_listings_when_a_page_fails(self, mock_sleep, sync_service, db, discogs_factory):
+        """Test that an incomplete fetch doesn't remove listings missing from it."""
+        stored = Listing(listing_id='99999', release_id='109', artist_names='Artist 9', release_title='Title 9', price_value=10.0)
+        db.session.add(stored)
+        db.session.commit()
+        
+        url = f"{sync_service.base_url}/users/{sync_service.seller_username}/inventory"
+        first_page = discogs_factory.create_listings_page(page=1, per_page=100, total_items=250)
+        
+        def page_callback(request):
+            if int(request.params['page']) == 1:
+                return (200, {}, json.dumps(first_page))
+            return (404, {}, '')
+        
+        responses.add_callback(responses.GET, url, callback=page_callback)
+        
+        stats = sync_service.sync_all_listings()
+        
+        assert stats['added'] == 100
+        assert stats['removed'] == 0
+        assert Listing.query.filter_by(listing_id='99999').count() == 1
+    
     @responses.activate
     @patch('time.sleep')
     def test_sync_handles_mixed_operations(self, mock_sleep, sync_service, db, discogs_factory):
@@ -313,6 +577,120 @@ class TestSyncAllListings:
         assert stats['updated'] == 1
         assert stats['removed'] == 1
         assert Listing.query.count() == 2
+    
+    @responses.activate
+    @patch('time.sleep')
+    def test_sync_skips_listings_without_id(self, mock_sleep, sync_service, db, discogs_factory):
+        """Test that listings missing an ID are counted as skipped and not stored."""
+        url = f"{sync_service.base_url}/users/{sync_service.seller_username}/inventory"
+        bad_listing = discogs_factory.create_listing()
+        del bad_listing['id']
+        page_data = {
+            'pagination': {'page': 1, 'pages': 1, 'items': 2, 'per_page': 100},
+            'listings': [discogs_factory.create_listing(id=11111), bad_listing]
+        }
+        responses.add(responses.GET, url, json=page_data, status=200)
+        
+        with patch.object(sync_service, '_flatten_listing', wraps=sync_service._flatten_listing) as mock_flatten:
+            stats = sync_service.sync_all_listings()
+        
+        assert stats['total'] == 2
+        assert stats['added'] == 1
+        assert stats['skipped'] == 1
+        assert mock_flatten.call_count == 1
+        assert Listing.query.count() == 1
+    
+    @responses.activate
+    @patch('time.sleep')
+    def test_sync_skips_unchanged_hash(self, mock_sleep, sync_service, db, discogs_factory, sql_statements):
+        """Test that a repeat sync of identical data compares nothing and writes no UPDATEs."""
+        url = f"{sync_service.base_url}/users/{sync_service.seller_username}/inventory"
+        page_data = discogs_factory.create_listings_page(page=1, per_page=100, total_items=20)
+        responses.add(responses.GET, url, json=page_data, status=200)
+        
+        sync_service.sync_all_listings()
+        assert Listing.query.filter(Listing.content_hash.is_(None)).count() == 0
+        
+        sql_statements.clear()
+        with patch.object(sync_service, '_get_changed_fields') as mock_compare:
+            stats = sync_service.sync_all_listings()
+        
+        assert stats['updated'] == 0
+        assert 'UPDATE' not in sql_statements
+        mock_compare.assert_not_called()
+    
+    @responses.activate
+    @patch('time.sleep')
+    def test_sync_bulk_removal_single_statement_per_chunk(self, mock_sleep, sync_service, db, discogs_factory, sql_statements):
+        """Test that removed listings are deleted with one statement per batch of IDs."""
+        db.session.add_all([
+            Listing(listing_id=str(listing_id), release_id='1', price_value=10.0)
+            for listing_id in range(1, 12)
+        ])
+        db.session.commit()
+        
+        url = f"{sync_service.base_url}/users/{sync_service.seller_username}/inventory"
+        page_data = discogs_factory.create_listings_page(page=1, per_page=100, total_items=1, id=1)
+        responses.add(responses.GET, url, json=page_data, status=200)
+        
+        sync_service.DELETE_BATCH_SIZE = 4
+        sql_statements.clear()
+        stats = sync_service.sync_all_listings()
+        
+        assert stats['removed'] == 10
+        assert sql_statements.count('DELETE') == 3
+        assert Listing.query.count() == 1
+    
+    def test_listing_id_lookup_uses_index(self, db):
+        """Test that lookups by Discogs listing ID are served by the listing_id index."""
+        plan = db.session.execute(
+            text('EXPLAIN QUERY PLAN SELECT * FROM listings WHERE listing_id = :listing_id'),
+            {'listing_id': '123'}
+        ).fetchall()
+        
+        details = ' '.join(row[-1] for row in plan)
+        assert 'USING INDEX ix_listings_listing_id' in details
+        assert 'SCAN' not in details
+    
+    @responses.activate
+    @patch('time.sleep')
+    def test_sync_bulk_insert_single_roundtrip(self, mock_sleep, sync_service, db, discogs_factory, sql_statements):
+        """Test that a full page of new listings is written with one INSERT."""
+        url = f"{sync_service.base_url}/users/{sync_service.seller_username}/inventory"
+        page_data = discogs_factory.create_listings_page(page=1, per_page=100, total_items=100)
+        responses.add(responses.GET, url, json=page_data, status=200)
+        
+        stats = sync_service.sync_all_listings()
+        
+        assert sql_statements.count('INSERT') == 1
+        assert len([s for s in sql_statements if s in ('SELECT', 'INSERT', 'UPDATE', 'DELETE')]) <= 4
+        assert stats['added'] == 100
+        assert Listing.query.count() == 100
+    
+    @responses.activate
+    @patch('time.sleep')
+    def test_sync_loads_existing_listings_with_one_select(self, mock_sleep, sync_service, db, discogs_factory, sql_statements):
+        """Test that stored listings are looked up with a single SELECT, not one per API listing."""
+        db.session.add_all([
+            Listing(listing_id=str(listing_id), release_id='1', price_value=10.0)
+            for listing_id in range(1, 51)
+        ])
+        db.session.commit()
+        
+        url = f"{sync_service.base_url}/users/{sync_service.seller_username}/inventory"
+        listings = [discogs_factory.create_listing(id=listing_id) for listing_id in range(1, 41)]
+        page_data = {
+            'pagination': {'page': 1, 'pages': 1, 'items': 40, 'per_page': 100},
+            'listings': listings
+        }
+        responses.add(responses.GET, url, json=page_data, status=200)
+        
+        sql_statements.clear()
+        stats = sync_service.sync_all_listings()
+        
+        assert stats['updated'] == 40
+        assert stats['removed'] == 10
+        assert sql_statements.count('SELECT') == 1
 
 
 class TestFlattenListing:
@@ -380,6 +758,14 @@ class TestFlattenListing:
         assert result['barcode'] == ''
         assert result['styles'] == ''
     
+    def test_flatten_precomputes_label_urls(self, sync_service, mock_listing):
+        """Test that label reference URLs are stored in custom_metadata."""
+        result = sync_service._flatten_listing(mock_listing)
+        
+        label_urls = result['custom_metadata']['label_urls']
+        assert len(label_urls) == 3
+        assert any('Discogs' in url['title'] for url in label_urls)
+    
     @freeze_time("2024-01-15 12:00:00")
     def test_flatten_timestamp(self, sync_service, mock_listing):
         """Test that export timestamp is added."""
@@ -437,3 +823,17 @@ class TestUpdateListingFromDict:
         assert listing.artist_names == 'New Artist'
         assert not hasattr(listing, 'invalid_field')
         assert not hasattr(listing, 'another_fake_field')
+    
+    def test_update_ignores_non_column_attributes(self, sync_service, db):
+        """Test that only mapped columns are set, even for names the model does have."""
+        listing = Listing(listing_id='12345', release_id='100', price_value=10.0)
+        db.session.add(listing)
+        db.session.commit()
+        
+        update_data = {'unknown_field': 1, 'to_dict': 'not a method', 'price_value': 12.0}
+        
+        sync_service._update_listing_from_dict(listing, update_data)
+        
+        assert listing.price_value == 12.0
+        assert callable(listing.to_dict)
+        assert not hasattr(listing, 'unknown_field')
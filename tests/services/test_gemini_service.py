@@ -9,10 +9,25 @@ This module tests the Google Gemini AI integration service, including:
 """
 
 import pytest
+from functools import lru_cache
+from types import SimpleNamespace
 from unittest.mock import Mock, patch, MagicMock
 from app.services.gemini_service import GeminiService
 
 
+@lru_cache(maxsize=None)
+def _cached_response(text: str) -> SimpleNamespace:
+    """
+    Build a successful generate_content response with one candidate.
+    
+    Plain namespaces are cheaper than a Mock chain and hold no call state,
+    so one response per text is shared by every test that needs it.
+    """
+    part = SimpleNamespace(text=text)
+    candidate = SimpleNamespace(content=SimpleNamespace(parts=(part,)), finish_reason=1)
+    return SimpleNamespace(candidates=(candidate,))
+
+
 class TestGeminiServiceInit:
     """Test GeminiService initialization."""
     
@@ -106,20 +121,10 @@ class TestGenerateLabelOverview:
         mock_model = Mock()
         mock_model_class.return_value = mock_model
         
-        # Mock response with proper structure
-        mock_part = Mock()
-        mock_part.text = "Blue Note Records was founded in 1939. It's a legendary jazz label. Artists include Miles Davis and John Coltrane. Known for iconic album covers."
-        
-        mock_content = Mock()
-        mock_content.parts = [mock_part]
-        
-        mock_candidate = Mock()
-        mock_candidate.content = mock_content
-        
-        mock_response = Mock()
-        mock_response.candidates = [mock_candidate]
-        
-        mock_model.generate_content.return_value = mock_response
+        mock_model.generate_content.return_value = _cached_response(
+            "Blue Note Records was founded in 1939. It's a legendary jazz label. "
+            "Artists include Miles Davis and John Coltrane. Known for iconic album covers."
+        )
         
         # Test
         service = GeminiService()
@@ -207,16 +212,7 @@ class TestGenerateLabelOverview:
         mock_model = Mock()
         mock_model_class.return_value = mock_model
         
-        # Mock successful response
-        mock_part = Mock()
-        mock_part.text = "Test overview"
-        mock_content = Mock()
-        mock_content.parts = [mock_part]
-        mock_candidate = Mock()
-        mock_candidate.content = mock_content
-        mock_response = Mock()
-        mock_response.candidates = [mock_candidate]
-        mock_model.generate_content.return_value = mock_response
+        mock_model.generate_content.return_value = _cached_response("Test overview")
         
         service = GeminiService()
         service.generate_label_overview("Test Label")
@@ -237,16 +233,7 @@ class TestGenerateLabelOverview:
         mock_model = Mock()
         mock_model_class.return_value = mock_model
         
-        # Mock successful response
-        mock_part = Mock()
-        mock_part.text = "Test overview"
-        mock_content = Mock()
-        mock_content.parts = [mock_part]
-        mock_candidate = Mock()
-        mock_candidate.content = mock_content
-        mock_response = Mock()
-        mock_response.candidates = [mock_candidate]
-        mock_model.generate_content.return_value = mock_response
+        mock_model.generate_content.return_value = _cached_response("Test overview")
         
         service = GeminiService()
         service.generate_label_overview("Test Label")
@@ -336,21 +323,11 @@ class TestGeminiServiceIntegration:
         
         # Mock different responses for different labels
         def generate_response(prompt, **kwargs):
-            mock_part = Mock()
             if "Blue Note" in str(prompt):
-                mock_part.text = "Blue Note overview"
+                return _cached_response("Blue Note overview")
             elif "Motown" in str(prompt):
-                mock_part.text = "Motown overview"
-            else:
-                mock_part.text = "Generic overview"
-            
-            mock_content = Mock()
-            mock_content.parts = [mock_part]
-            mock_candidate = Mock()
-            mock_candidate.content = mock_content
-            mock_response = Mock()
-            mock_response.candidates = [mock_candidate]
-            return mock_response
+                return _cached_response("Motown overview")
+            return _cached_response("Generic overview")
         
         mock_model.generate_content.side_effect = generate_response
         
@@ -374,16 +351,7 @@ class TestGeminiServiceIntegration:
         mock_model = Mock()
         mock_model_class.return_value = mock_model
         
-        # Mock successful response
-        mock_part = Mock()
-        mock_part.text = "Test overview"
-        mock_content = Mock()
-        mock_content.parts = [mock_part]
-        mock_candidate = Mock()
-        mock_candidate.content = mock_content
-        mock_response = Mock()
-        mock_response.candidates = [mock_candidate]
-        mock_model.generate_content.return_value = mock_response
+        mock_model.generate_content.return_value = _cached_response("Test overview")
         
         service = GeminiService()
         
@@ -407,16 +375,7 @@ class TestEdgeCases:
         mock_model = Mock()
         mock_model_class.return_value = mock_model
         
-        # Mock successful response even for empty name
-        mock_part = Mock()
-        mock_part.text = "Generic overview"
-        mock_content = Mock()
-        mock_content.parts = [mock_part]
-        mock_candidate = Mock()
-        mock_candidate.content = mock_content
-        mock_response = Mock()
-        mock_response.candidates = [mock_candidate]
-        mock_model.generate_content.return_value = mock_response
+        mock_model.generate_content.return_value = _cached_response("Generic overview")
         
         service = GeminiService()
         result = service.generate_label_overview("")
@@ -433,15 +392,7 @@ class TestEdgeCases:
         mock_model = Mock()
         mock_model_class.return_value = mock_model
         
-        mock_part = Mock()
-        mock_part.text = "Label overview with special chars"
-        mock_content = Mock()
-        mock_content.parts = [mock_part]
-        mock_candidate = Mock()
-        mock_candidate.content = mock_content
-        mock_response = Mock()
-        mock_response.candidates = [mock_candidate]
-        mock_model.generate_content.return_value = mock_response
+        mock_model.generate_content.return_value = _cached_response("Label overview with special chars")
         
         service = GeminiService()
         
@@ -463,16 +414,7 @@ class TestEdgeCases:
         mock_model = Mock()
         mock_model_class.return_value = mock_model
         
-        # Mock response with extra whitespace
-        mock_part = Mock()
-        mock_part.text = "  \n  Test overview with whitespace  \n  "
-        mock_content = Mock()
-        mock_content.parts = [mock_part]
-        mock_candidate = Mock()
-        mock_candidate.content = mock_content
-        mock_response = Mock()
-        mock_response.candidates = [mock_candidate]
-        mock_model.generate_content.return_value = mock_response
+        mock_model.generate_content.return_value = _cached_response("  \n  Test overview with whitespace  \n  ")
         
         service = GeminiService()
         result = service.generate_label_overview("Test Label")
@@ -512,19 +454,7 @@ class TestPromptBuilding:
 @pytest.fixture
 def mock_gemini_response():
     """Create a mock successful Gemini response."""
-    mock_part = Mock()
-    mock_part.text = "This is a test label overview with information about genres and artists."
-    
-    mock_content = Mock()
-    mock_content.parts = [mock_part]
-    
-    mock_candidate = Mock()
-    mock_candidate.content = mock_content
-    
-    mock_response = Mock()
-    mock_response.candidates = [mock_candidate]
-    
-    return mock_response
+    return _cached_response("This is a test label overview with information about genres and artists.")
 
 
 @pytest.fixture
@@ -11,6 +11,7 @@ This module tests the label overview and caching functionality in InventoryServi
 import pytest
 from unittest.mock import Mock, patch, call
 from datetime import datetime
+from sqlalchemy.dialects.sqlite import Insert as SQLiteInsert
 
 from app.services.inventory_service import InventoryService
 from app.models.listing import Listing
@@ -306,21 +307,22 @@ class TestCacheLabelOverview:
             assert cached is not None
             assert cached.overview == f"Overview for {label}"
     
-    @patch('app.services.inventory_service.current_app')
-    @patch('app.services.inventory_service.db.session')
-    def test_cache_handles_database_error(self, mock_session, mock_app, app_context):
-        """Test that caching handles database errors gracefully."""
-        mock_session.commit.side_effect = Exception("Database error")
-        
+    def test_cache_handles_database_error(self, app_context, db):
+        """Test that a failing upsert is rolled back and not raised."""
         service = InventoryService()
         
-        # Should not raise exception
-        try:
-            service._cache_label_overview("Test Label", "Overview")
-        except Exception:
-            pytest.fail("Should handle database errors gracefully")
-        
-        mock_session.rollback.assert_called()
+        with patch.object(db.session, 'execute', side_effect=Exception("Database error")) as mock_execute, \
+                patch.object(db.session, 'rollback', wraps=db.session.rollback) as mock_rollback:
+            # Should not raise exception
+            try:
+                service._cache_label_overview("Upsert Error Label", "Overview")
+            except Exception:
+                pytest.fail("Should handle database errors gracefully")
+        
+        # The failure came from the dialect upsert, not the row-by-row fallback
+        assert isinstance(mock_execute.call_args[0][0], SQLiteInsert)
+        mock_rollback.assert_called()
+        assert LabelInfo.query.filter_by(label_name="Upsert Error Label").first() is None
 
 
 class TestGetItemWithVideosAndOverviews:
@@ -0,0 +1,166 @@
+"""
+Unit tests for InventoryService listing queries.
+
+This module tests the listing-level functionality in InventoryService:
+- YouTube video extraction from release details
+- Precomputed label URLs in detail responses
+- Cached /api/data payload and ETag
+- Cache invalidation
+- Search filters
+"""
+
+import responses
+from unittest.mock import patch
+
+from app.extensions import cache
+from app.services.inventory_service import (
+    ALL_ITEMS_JSON_CACHE_KEY, FACETS_CACHE_KEY, InventoryService
+)
+from app.models.listing import Listing
+
+
+def _make_listing(listing_id, **overrides):
+    """Build a minimal valid Listing for inventory tests."""
+    fields = {
+        'listing_id': listing_id,
+        'release_id': '100',
+        'release_title': f'Title {listing_id}',
+        'artist_names': 'Test Artist',
+        'price_value': 10.0
+    }
+    fields.update(overrides)
+    return Listing(**fields)
+
+
+class TestFetchReleaseVideos:
+    """Test the _fetch_release_videos method."""
+
+    @responses.activate
+    def test_extracts_youtube_ids_from_all_uri_forms(self, app_context):
+        """Test that watch, short and embed YouTube URIs are recognised."""
+        responses.add(
+            responses.GET,
+            'https://api.discogs.com/releases/42',
+            json={'videos': [
+                {'uri': 'https://www.youtube.com/watch?v=AAAAAAAAAAA&t=10', 'title': 'Watch'},
+                {'uri': 'https://youtu.be/BBBBBBBBBBB', 'title': 'Short'},
+                {'uri': 'https://www.youtube.com/embed/CCCCCCCCCCC', 'title': 'Embed'},
+                {'uri': 'https://vimeo.com/12345', 'title': 'Other'}
+            ]},
+            status=200
+        )
+
+        service = InventoryService()
+        videos = service._fetch_release_videos('42')
+
+        assert [video['youtube_id'] for video in videos] == ['AAAAAAAAAAA', 'BBBBBBBBBBB', 'CCCCCCCCCCC']
+        assert videos[0]['thumbnail'] == 'https://img.youtube.com/vi/AAAAAAAAAAA/maxresdefault.jpg'
+
+
+class TestDetailLabelUrls:
+    """Test label URL handling in detail responses."""
+
+    def test_uses_precomputed_label_urls(self, app_context, db, session):
+        """Test that label URLs stored at sync time are returned as-is."""
+        stored = [{'title': 'Stored', 'url': 'https://example.com', 'description': 'Stored URL'}]
+        listing = _make_listing('stored1', label_names='Stored Label', custom_metadata={'label_urls': stored})
+        session.add(listing)
+        session.commit()
+
+        service = InventoryService()
+        with patch.object(InventoryService, '_fetch_release_videos', return_value=[]), \
+                patch.object(InventoryService, '_get_label_overviews', return_value={}):
+            result = service.get_item_with_videos('stored1')
+
+        assert result['label_urls'] == stored
+
+    def test_generates_label_urls_for_legacy_rows(self, app_context, db, session):
+        """Test that rows without stored URLs fall back to generating them."""
+        session.add(_make_listing('legacy1', label_names='Legacy Label'))
+        session.commit()
+
+        service = InventoryService()
+        with patch.object(InventoryService, '_fetch_release_videos', return_value=[]), \
+                patch.object(InventoryService, '_get_label_overviews', return_value={}):
+            result = service.get_item_with_videos('legacy1')
+
+        assert len(result['label_urls']) == 3
+
+
+class TestAllItemsPayload:
+    """Test the cached /api/data payload."""
+
+    def test_payload_etag_tracks_body(self, app_context, db, session):
+        """Test that the ETag changes when a sync invalidates the body."""
+        session.add(_make_listing('payload1'))
+        session.commit()
+
+        service = InventoryService()
+        first = service.get_all_items_payload()
+        assert service.get_all_items_payload()['etag'] == first['etag']
+
+        session.add(_make_listing('payload2'))
+        session.commit()
+        InventoryService.invalidate_cache()
+
+        second = service.get_all_items_payload()
+        assert second['etag'] != first['etag']
+        assert b'payload2' in second['body']
+
+    def test_payload_includes_gzip_body(self, app_context, db, session):
+        """Test that the compressed body decompresses to the JSON body."""
+        import gzip
+
+        session.add(_make_listing('gzip1'))
+        session.commit()
+
+        payload = InventoryService().get_all_items_payload()
+
+        assert gzip.decompress(payload['gzip']) == payload['body']
+
+
+class TestInvalidateCache:
+    """Test InventoryService.invalidate_cache."""
+
+    def test_invalidate_clears_keys_after_a_missing_one(self, app_context):
+        """Test that every key is dropped even when earlier keys aren't cached."""
+        cache.set(ALL_ITEMS_JSON_CACHE_KEY, {'body': b'[]'})
+        cache.set(FACETS_CACHE_KEY, {'genres': []})
+
+        InventoryService.invalidate_cache()
+
+        assert cache.get(ALL_ITEMS_JSON_CACHE_KEY) is None
+        assert cache.get(FACETS_CACHE_KEY) is None
+
+
+class TestSearchItems:
+    """Test the search_items filters."""
+
+    def test_search_is_case_insensitive_substring(self, app_context, db, session):
+        """Test that queries match title or artist substrings in any case."""
+        session.add_all([
+            _make_listing('search1', release_title='Deep House Classics', artist_names='DJ Sprinkles'),
+            _make_listing('search2', release_title='Ambient Works', artist_names='Aphex Twin', genres='Electronic')
+        ])
+        session.commit()
+
+        service = InventoryService()
+
+        assert [item['listing_id'] for item in service.search_items(query='dj')] == ['search1']
+        assert [item['listing_id'] for item in service.search_items(query='AMBIENT')] == ['search2']
+        assert [item['listing_id'] for item in service.search_items(genre='electro')] == ['search2']
+
+    def test_search_reflects_removed_listings(self, app_context, db, session):
+        """Test that removed listings drop out of search results."""
+        listing = _make_listing('search3', release_title='Gone Soon')
+        session.add(listing)
+        session.commit()
+
+        service = InventoryService()
+        assert len(service.search_items(query='gone soon')) == 1
+
+        session.delete(listing)
+        session.commit()
+
+        assert service.search_items(query='gone soon') == []
+
@@ -32,7 +32,8 @@ def real_discogs_data():
     if not should_run_real_data_tests():
         pytest.skip("Real data tests disabled. Set ENABLE_REAL_DATA_TESTS=true to enable.")
     
-    data_file = Path(__file__).parent.parent / 'fixtures' / 'real_discogs_data.json'
+    fixture_dir = os.getenv('FREAKIN_TEST_FIXTURE_DIR', Path(__file__).parent.parent / 'fixtures')
+    data_file = Path(fixture_dir) / 'real_discogs_data.json'
     
     if not data_file.exists():
         pytest.skip(
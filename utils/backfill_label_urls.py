@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""
+Backfill Precomputed Label URLs
+
+Listings synced before label URLs were precomputed have no
+custom_metadata['label_urls']. This utility fills them in so detail views
+can skip URL generation for every listing.
+"""
+
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app import create_app
+from app.extensions import db
+from app.models.listing import Listing
+from app.services.inventory_service import generate_label_urls
+
+def main():
+    app = create_app()
+    
+    with app.app_context():
+        print("="*70)
+        print("🔗 Backfill Label URLs")
+        print("="*70)
+        
+        updated = 0
+        for listing in Listing.query.all():
+            metadata = dict(listing.custom_metadata or {})
+            if 'label_urls' in metadata:
+                continue
+            
+            metadata['label_urls'] = generate_label_urls(listing.label_names)
+            listing.custom_metadata = metadata
+            updated += 1
+        
+        db.session.commit()
+        
+        print(f"✅ Backfilled label URLs for {updated} listing(s)")
+
+if __name__ == '__main__':
+    main()
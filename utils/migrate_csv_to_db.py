@@ -43,6 +43,24 @@ def find_csv_file(base_dir: Path, pattern: str) -> Path:
     return max(csv_files, key=lambda p: p.stat().st_mtime)
 
 
+def estimate_row_count(csv_file: Path) -> int:
+    """
+    Estimate the number of data rows in a CSV file by counting newlines.
+    
+    Quoted fields containing newlines are counted more than once, so this is
+    only used for progress output.
+    
+    Args:
+        csv_file: Path to CSV file
+        
+    Returns:
+        Approximate number of data rows (excluding the header)
+    """
+    with open(csv_file, 'rb') as f:
+        lines = sum(chunk.count(b'\n') for chunk in iter(lambda: f.read(1 << 20), b''))
+    return max(0, lines - 1)
+
+
 def convert_to_float(value):
     """Convert a value to float, returning None if invalid."""
     if not value or value.strip() == '':
@@ -70,6 +88,62 @@ def clean_string(value):
     return value.strip()
 
 
+# CSV columns imported into Listing, in file order, with their converters
+CSV_COLUMNS = (
+    ('status', clean_string),
+    ('condition', clean_string),
+    ('sleeve_condition', clean_string),
+    ('posted', clean_string),
+    ('uri', clean_string),
+    ('resource_url', clean_string),
+    # Price information
+    ('price_value', convert_to_float),
+    ('price_currency', clean_string),
+    # Shipping information
+    ('shipping_price', convert_to_float),
+    ('shipping_currency', clean_string),
+    # Additional details
+    ('weight', convert_to_float),
+    ('format_quantity', convert_to_int),
+    ('external_id', clean_string),
+    ('location', clean_string),
+    ('comments', clean_string),
+    # Release information
+    ('release_id', clean_string),
+    ('release_title', clean_string),
+    ('release_year', clean_string),
+    ('release_resource_url', clean_string),
+    ('release_uri', clean_string),
+    # Artist information
+    ('artist_names', clean_string),
+    ('primary_artist', clean_string),
+    # Label information
+    ('label_names', clean_string),
+    ('primary_label', clean_string),
+    # Format information
+    ('format_names', clean_string),
+    ('primary_format', clean_string),
+    # Genre and style
+    ('genres', clean_string),
+    ('styles', clean_string),
+    # Country
+    ('country', clean_string),
+    # Additional release details
+    ('catalog_number', clean_string),
+    ('barcode', clean_string),
+    ('master_id', clean_string),
+    ('master_url', clean_string),
+    # Images
+    ('image_uri', clean_string),
+    ('image_resource_url', clean_string),
+    # Statistics
+    ('release_community_have', convert_to_int),
+    ('release_community_want', convert_to_int),
+    # Timestamps
+    ('export_timestamp', clean_string),
+)
+
+
 def import_csv_to_database(csv_file: Path, app) -> dict:
     """
     Import CSV data into the database.
@@ -92,18 +166,26 @@ def import_csv_to_database(csv_file: Path, app) -> dict:
     with app.app_context():
         print(f"📂 Reading CSV file: {csv_file}")
         
+        estimated_rows = estimate_row_count(csv_file)
+        print(f"📊 Found ~{estimated_rows} rows in CSV")
+        
         with open(csv_file, 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
-            rows = list(reader)
-            stats['total_rows'] = len(rows)
+            reader = csv.reader(f)
+            
+            # Resolve each column's position once from the header row
+            header = {name: idx for idx, name in enumerate(next(reader, []))}
+            listing_id_idx = header.get('listing_id')
+            columns = [(column, convert, header.get(column)) for column, convert in CSV_COLUMNS]
             
-            print(f"📊 Found {stats['total_rows']} rows in CSV")
             print("🔄 Processing rows...")
             
-            for i, row in enumerate(rows, 1):
+            # Stream rows from the reader rather than loading the whole file
+            for i, row in enumerate(reader, 1):
+                stats['total_rows'] = i
                 try:
                     # Get or create listing by listing_id
-                    listing_id = clean_string(row.get('listing_id'))
+                    width = len(row)
+                    listing_id = clean_string(row[listing_id_idx]) if listing_id_idx is not None and listing_id_idx < width else None
                     
                     if not listing_id:
                         print(f"⚠️  Row {i}: Skipping row with no listing_id")
@@ -123,70 +205,8 @@ def import_csv_to_database(csv_file: Path, app) -> dict:
                         stats['imported'] += 1
                     
                     # Map CSV fields to model attributes
-                    listing.status = clean_string(row.get('status'))
-                    listing.condition = clean_string(row.get('condition'))
-                    listing.sleeve_condition = clean_string(row.get('sleeve_condition'))
-                    listing.posted = clean_string(row.get('posted'))
-                    listing.uri = clean_string(row.get('uri'))
-                    listing.resource_url = clean_string(row.get('resource_url'))
-                    
-                    # Price information
-                    listing.price_value = convert_to_float(row.get('price_value'))
-                    listing.price_currency = clean_string(row.get('price_currency'))
-                    
-                    # Shipping information
-                    listing.shipping_price = convert_to_float(row.get('shipping_price'))
-                    listing.shipping_currency = clean_string(row.get('shipping_currency'))
-                    
-                    # Additional details
-                    listing.weight = convert_to_float(row.get('weight'))
-                    listing.format_quantity = convert_to_int(row.get('format_quantity'))
-                    listing.external_id = clean_string(row.get('external_id'))
-                    listing.location = clean_string(row.get('location'))
-                    listing.comments = clean_string(row.get('comments'))
-                    
-                    # Release information
-                    listing.release_id = clean_string(row.get('release_id'))
-                    listing.release_title = clean_string(row.get('release_title'))
-                    listing.release_year = clean_string(row.get('release_year'))
-                    listing.release_resource_url = clean_string(row.get('release_resource_url'))
-                    listing.release_uri = clean_string(row.get('release_uri'))
-                    
-                    # Artist information
-                    listing.artist_names = clean_string(row.get('artist_names'))
-                    listing.primary_artist = clean_string(row.get('primary_artist'))
-                    
-                    # Label information
-                    listing.label_names = clean_string(row.get('label_names'))
-                    listing.primary_label = clean_string(row.get('primary_label'))
-                    
-                    # Format information
-                    listing.format_names = clean_string(row.get('format_names'))
-                    listing.primary_format = clean_string(row.get('primary_format'))
-                    
-                    # Genre and style
-                    listing.genres = clean_string(row.get('genres'))
-                    listing.styles = clean_string(row.get('styles'))
-                    
-                    # Country
-                    listing.country = clean_string(row.get('country'))
-                    
-                    # Additional release details
-                    listing.catalog_number = clean_string(row.get('catalog_number'))
-                    listing.barcode = clean_string(row.get('barcode'))
-                    listing.master_id = clean_string(row.get('master_id'))
-                    listing.master_url = clean_string(row.get('master_url'))
-                    
-                    # Images
-                    listing.image_uri = clean_string(row.get('image_uri'))
-                    listing.image_resource_url = clean_string(row.get('image_resource_url'))
-                    
-                    # Statistics
-                    listing.release_community_have = convert_to_int(row.get('release_community_have'))
-                    listing.release_community_want = convert_to_int(row.get('release_community_want'))
-                    
-                    # Timestamps
-                    listing.export_timestamp = clean_string(row.get('export_timestamp'))
+                    for column, convert, idx in columns:
+                        setattr(listing, column, convert(row[idx] if idx is not None and idx < width else None))
                     
                     if is_new:
                         db.session.add(listing)
@@ -194,7 +214,7 @@ def import_csv_to_database(csv_file: Path, app) -> dict:
                     # Commit every 100 rows
                     if i % 100 == 0:
                         db.session.commit()
-                        print(f"  ✓ Processed {i}/{stats['total_rows']} rows...")
+                        print(f"  ✓ Processed {i}/~{estimated_rows} rows...")
                 
                 except Exception as e:
                     print(f"❌ Error processing row {i}: {e}")
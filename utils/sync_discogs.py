@@ -37,13 +37,12 @@ def main():
         print("This may take 2-3 minutes for large inventories...")
         print("")
         
-        sync_service = DiscogsSyncService(
+        with DiscogsSyncService(
             token=token,
             seller_username=username,
             user_agent=app.config.get('DISCOGS_USER_AGENT', 'FreakinbeatsWebApp/1.0')
-        )
-        
-        stats = sync_service.sync_all_listings()
+        ) as sync_service:
+            stats = sync_service.sync_all_listings()
         
         # Verify database
         count = Listing.query.count()